@@ -1,7 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from streamlit_option_menu import option_menu
+import gzip
 import json
+import math
+
+from auction.admin import get_profiler, profiler_panel
+from auction.filters import FilterEngine
+from auction.grid import WindowedGrid, windowed_grid
+from auction.ingest import PoolCache
+from auction.ledger import AuctionLedger
+from auction.playing_xi import PlayingXIStore
+from auction.profiling import profiled, span
+from auction.search import NameSearch, name_columns
+from auction.snapshot import dump_json
+from auction.store import PoolStore
 
 
 if "auction_list_file_df" not in st.session_state:
@@ -16,6 +30,74 @@ def load_data(file, file_type):
     else:
         raise ValueError("Unsupported file type")
 
+@st.cache_resource
+def get_pool_cache():
+    # Shared across sessions so a reconnect doesn't re-parse the same upload
+    return PoolCache(max_entries=4, store=PoolStore())
+
+@st.cache_resource(max_entries=4)
+def get_filter_engine(digest, _auction_list):
+    # Category codes, value bitmaps and distinct values are built once per uploaded pool
+    return FilterEngine(_auction_list)
+
+@st.cache_resource(max_entries=4)
+def get_pool_grid(digest, _auction_list):
+    # Sorted orders are computed once per column and kept for every later page
+    return WindowedGrid(_auction_list)
+
+@st.cache_resource(max_entries=4)
+def get_name_search(digest, _auction_list):
+    # Trigram index over the pool's names, built once per uploaded pool
+    return NameSearch.from_pool(_auction_list)
+
+@st.cache_resource
+def get_ledger():
+    # Same SQLite ledger the live auction app writes its sales to
+    return AuctionLedger()
+
+@st.cache_resource(max_entries=8)
+def get_analytics(digest, ledger_version, _auction_list):
+    # Rebuilt only when a new event reaches the ledger or a different pool is loaded;
+    # imported here so the other pages don't load the analytics code
+    from auction.analytics import AuctionAnalytics
+
+    return AuctionAnalytics(get_ledger().sales(), _auction_list)
+
+def sidebar_filter_mask(auction_list):
+    """Renders the sidebar filters and returns a boolean mask over the pool, or None if nothing is filtered."""
+    digest = st.session_state.get("auction_list_digest")
+    engine = get_filter_engine(digest, auction_list) if digest else FilterEngine(auction_list)
+
+    # Dynamically create filters based on available columns
+    num_filters = 4  # Number of filters to allow
+    equals = []
+    for i in range(num_filters):
+        filter_column = st.selectbox(f"Select column for Filter {i + 1}", ["None"] + list(auction_list.columns), key=f"filter_col_{i}")
+        if filter_column != "None":
+            unique_values = ["All"] + engine.distinct_values(filter_column)
+            selected_value = st.selectbox(f"Select value for '{filter_column}'", unique_values, key=f"filter_val_{i}")
+            if selected_value != "All":
+                equals.append((filter_column, selected_value))
+
+    # Range filters for caps and reserve price columns
+    ranges = {}
+    range_columns = [col for col in engine.numeric_columns if "cap" in col.lower() or "reserve" in col.lower()]
+    if range_columns:
+        with st.expander("Numeric Ranges"):
+            for col in range_columns:
+                low, high = engine.bounds(col)
+                low, high = math.floor(low), math.ceil(high)
+                if low == high:
+                    continue
+                selected_range = st.slider(f"Range for '{col}'", min_value=low, max_value=high, value=(low, high), key=f"filter_range_{col}")
+                if selected_range != (low, high):
+                    ranges[col] = selected_range
+
+    if not equals and not ranges:
+        return None
+    with span("filter"):
+        return engine.mask(equals, ranges)
+
 def home_page():    
     file_type_toggle = st.toggle("Upload CSV file", value=False, label_visibility='hidden')
     file_type = "XLSX" if file_type_toggle else "CSV"
@@ -28,13 +110,13 @@ def home_page():
     file_extension = "xlsx" if file_type == "XLSX" else "csv"
     auction_list_file = st.file_uploader(f"Upload a {file_type} file", type=[file_extension])
     if auction_list_file is not None:
-        if file_extension == 'csv':
-            auc_file_read = pd.read_csv(auction_list_file)
-        elif file_extension == 'xlsx':
-            auc_file_read = pd.read_excel(auction_list_file)
-            
-        st.session_state["auction_list_file_df"] = pd.DataFrame(auc_file_read)
-        st.success("File uploaded successfully!")
+        # Parsed once per distinct file; reruns get the cached DataFrame
+        with span("parse pool"):
+            digest, auc_file_read = get_pool_cache().load(auction_list_file.getvalue(), file_extension, normalize=False, source_name=auction_list_file.name)
+        if digest != st.session_state.get("auction_list_digest"):
+            st.session_state["auction_list_file_df"] = auc_file_read
+            st.session_state["auction_list_digest"] = digest
+            st.success("File uploaded successfully!")
 
     with st.sidebar:
         st.image("auc.png", width=250)
@@ -42,44 +124,23 @@ def home_page():
 
         if st.session_state.get("auction_list_file_df") is not None:
             auction_list = st.session_state["auction_list_file_df"]
-            
-            # Dynamically create filters based on available columns
-        num_filters = 4  # Number of filters to allow
-        filters = {}
-        filtered_data = auction_list  # Start with the full DataFrame
-        
-        for i in range(num_filters):
-            filter_column = st.selectbox(f"Select column for Filter {i + 1}", ["None"] + list(auction_list.columns), key=f"filter_col_{i}")
-            if filter_column != "None":
-                unique_values = ["All"] + auction_list[filter_column].dropna().unique().tolist()
-                selected_value = st.selectbox(f"Select value for '{filter_column}'", unique_values, key=f"filter_val_{i}")
-                if selected_value != "All":
-                    # Apply filter to the data
-                    filtered_data = filtered_data[filtered_data[filter_column] == selected_value]
-                    filters[filter_column] = selected_value
+            filter_mask = sidebar_filter_mask(auction_list)
     if st.session_state["auction_list_file_df"] is not None:
-            # Display the filtered DataFrame
-        st.data_editor(filtered_data)
+        # Only the visible page of the filtered, sorted pool is sent to the browser
+        digest = st.session_state.get("auction_list_digest")
+        grid = get_pool_grid(digest, auction_list) if digest else WindowedGrid(auction_list)
+        windowed_grid(grid, "pool_grid", filter_mask, editor=True)
     else:
         st.warning("Please upload a file to view the data.")
        
 
 
 def my_teams():
-    # Initialize session state for teams
-    if "first_playing_xi" not in st.session_state:
-        st.session_state["first_playing_xi"] = pd.DataFrame(columns=["Player Name"])
-    if "second_playing_xi" not in st.session_state:
-        st.session_state["second_playing_xi"] = pd.DataFrame(columns=["Player Name"])
-    if "third_playing_xi" not in st.session_state:
-        st.session_state["third_playing_xi"] = pd.DataFrame(columns=["Player Name"])
-    if "fourth_playing_xi" not in st.session_state:
-        st.session_state["fourth_playing_xi"] = pd.DataFrame(columns=["Player Name"])
-
-    # Function to flush a specific Playing XI DataFrame
-    def flush_team(team_name):
-        st.session_state[team_name] = pd.DataFrame(columns=["Player Name"])
-    
+    # One store holds every XI; the editors below only send it the rows that changed
+    if "playing_xis" not in st.session_state:
+        st.session_state["playing_xis"] = PlayingXIStore()
+    playing_xis = st.session_state["playing_xis"]
+
     # Check if auction_list_file_df exists in session state
     if st.session_state.get("auction_list_file_df") is not None:
         auction_list = st.session_state["auction_list_file_df"]
@@ -89,112 +150,77 @@ def my_teams():
             st.image("auc.png", width=250)
             st.header("Filter Options")
             
-            # Dynamically create filters based on available columns
-            num_filters = 4  # Number of filters to allow
-            filters = {}
-            filtered_data = auction_list  # Start with the full DataFrame
-            
-            for i in range(num_filters):
-                filter_column = st.selectbox(f"Select column for Filter {i + 1}", ["None"] + list(auction_list.columns), key=f"filter_col_{i}")
-                if filter_column != "None":
-                    unique_values = ["All"] + auction_list[filter_column].dropna().unique().tolist()
-                    selected_value = st.selectbox(f"Select value for '{filter_column}'", unique_values, key=f"filter_val_{i}")
-                    if selected_value != "All":
-                        # Apply filter to the data
-                        filtered_data = filtered_data[filtered_data[filter_column] == selected_value]
-                        filters[filter_column] = selected_value
-            
-            # If no filters applied, show a message
-        
-            
-        
+            filter_mask = sidebar_filter_mask(auction_list)
 
-                # Concatenate "First Name" and "Surname" if available
-            if "First Name" in filtered_data.columns and "Surname" in filtered_data.columns:
-                filtered_data["Full Name"] = filtered_data["First Name"] + " " + filtered_data["Surname"]
-                concatenated_names = filtered_data["Full Name"].tolist()
+            if name_columns(auction_list) and len(playing_xis):
+                # Names and player IDs come from the pool's search index, built once per upload
+                digest = st.session_state.get("auction_list_digest")
+                name_search = get_name_search(digest, auction_list) if digest else NameSearch.from_pool(auction_list)
+                positions = range(len(auction_list)) if filter_mask is None else np.flatnonzero(filter_mask).tolist()
+
+                # Typing narrows the filtered players to the best name matches instead of scrolling them all
+                name_query = st.text_input("Search players by name:", key="xi_player_search")
+                if name_query:
+                    positions = [hit.position for hit in name_search.search(name_query, limit=10, mask=filter_mask)]
 
                 st.write("Filtered Names:")
-                if concatenated_names:
-                    selected_name = st.selectbox("Select a player from the filtered results:", concatenated_names)
+                if len(positions):
+                    selected_pos = st.selectbox("Select a player from the filtered results:", positions, format_func=lambda pos: name_search.names[pos])
+                    selected_name = name_search.names[selected_pos]
 
                     # Select team to add the player
-                    team_choice = st.selectbox(
-                        "Select the team to add the player:",
-                        ["First Playing XI", "Second Playing XI", "Third Playing XI", "Fourth Playing XI"]
-                    )
+                    team_choice = st.selectbox("Select the team to add the player:", playing_xis.names())
 
                     # Confirm button
                     if st.button("Confirm"):
-                        if team_choice == "First Playing XI":
-                            team_df = st.session_state["first_playing_xi"]
-                        elif team_choice == "Second Playing XI":
-                            team_df = st.session_state["second_playing_xi"]
-                        elif team_choice == "Third Playing XI":
-                            team_df = st.session_state["third_playing_xi"]
-                        else:  # Fourth Playing XI
-                            team_df = st.session_state["fourth_playing_xi"]
-
-                        if selected_name not in team_df["Player Name"].values:
-                            team_df.loc[len(team_df)] = [selected_name]
+                        if playing_xis.add(team_choice, name_search.player_ids[selected_pos], selected_name):
                             st.success(f"Player '{selected_name}' has been added to the {team_choice}!")
                         else:
                             st.warning(f"Player '{selected_name}' is already in the {team_choice}.")
                 else:
                     st.write("No names available to select.")
-        # Display the Playing XI Teams in Cards with individual flush buttons
+
     # Display the Playing XI Teams in Tabs
     st.write("### Teams")
-    tabs = st.tabs(["First Playing XI", "Second Playing XI", "Third Playing XI", "Fourth Playing XI"])
-
-    # First Playing XI Tab
-    with tabs[0]:
-        st.write("### First Playing XI")
-        first_playing_xi = st.session_state["first_playing_xi"].copy()
-        edited_first_playing_xi = st.data_editor(first_playing_xi, key="editor_first_playing_xi")
-        if st.button("Flush First Playing XI", key="flush1"):
-            flush_team("first_playing_xi")
-            st.success("First Playing XI has been cleared!")
-        else:
-            # Update session state only if there are changes
-            if not first_playing_xi.equals(edited_first_playing_xi):
-                st.session_state["first_playing_xi"] = edited_first_playing_xi
-
-    # Second Playing XI Tab
-    with tabs[1]:
-        st.write("### Second Playing XI")
-        second_playing_xi = st.session_state["second_playing_xi"].copy()
-        edited_second_playing_xi = st.data_editor(second_playing_xi, key="editor_second_playing_xi")
-        if st.button("Flush Second Playing XI", key="flush2"):
-            flush_team("second_playing_xi")
-            st.success("Second Playing XI has been cleared!")
-        else:
-            if not second_playing_xi.equals(edited_second_playing_xi):
-                st.session_state["second_playing_xi"] = edited_second_playing_xi
-
-    # Third Playing XI Tab
-    with tabs[2]:
-        st.write("### Third Playing XI")
-        third_playing_xi = st.session_state["third_playing_xi"].copy()
-        edited_third_playing_xi = st.data_editor(third_playing_xi, key="editor_third_playing_xi")
-        if st.button("Flush Third Playing XI", key="flush3"):
-            flush_team("third_playing_xi")
-            st.success("Third Playing XI has been cleared!")
-        else:
-            if not third_playing_xi.equals(edited_third_playing_xi):
-                st.session_state["third_playing_xi"] = edited_third_playing_xi
-
-    # Fourth Playing XI Tab
-    with tabs[3]:
-        st.write("### Fourth Playing XI")
-        fourth_playing_xi = st.session_state["fourth_playing_xi"].copy()
-        edited_fourth_playing_xi = st.data_editor(fourth_playing_xi, key="editor_fourth_playing_xi")
-        if st.button("Flush Fourth Playing XI", key="flush4"):
-            flush_team("fourth_playing_xi")
-            st.success("Fourth Playing XI has been cleared!")
-        else:
-            if not fourth_playing_xi.equals(edited_fourth_playing_xi):
-                st.session_state["fourth_playing_xi"] = edited_fourth_playing_xi
+    col_new, col_add = st.columns([3, 1])
+    with col_new:
+        new_xi = st.text_input("New Playing XI name:", key="new_xi_name")
+    with col_add:
+        if st.button("Add Playing XI") and new_xi.strip():
+            if not playing_xis.add_xi(new_xi.strip()):
+                st.warning(f"There is already a team called '{new_xi.strip()}'.")
+
+    if not len(playing_xis):
+        st.info("Add a Playing XI to start picking players.")
+        return
+
+    def apply_xi_edits(xi, editor_key):
+        playing_xis.apply_edits(xi, st.session_state[editor_key])
+
+    tabs = st.tabs(playing_xis.names())
+    for tab, xi in zip(tabs, playing_xis.names()):
+        with tab:
+            st.write(f"### {xi}")
+            # Keyed by version: once its edits are applied, the editor starts again from the updated XI
+            editor_key = f"editor_xi_{xi}_{playing_xis.version(xi)}"
+            st.data_editor(
+                playing_xis.frame(xi),
+                key=editor_key,
+                num_rows="dynamic",
+                hide_index=True,
+                disabled=["Player ID"],
+                on_change=apply_xi_edits,
+                args=(xi, editor_key),
+            )
+            col_flush, col_delete = st.columns(2)
+            with col_flush:
+                if st.button(f"Flush {xi}", key=f"flush_{xi}"):
+                    playing_xis.clear(xi)
+                    st.success(f"{xi} has been cleared!")
+            with col_delete:
+                if st.button(f"Delete {xi}", key=f"delete_{xi}"):
+                    playing_xis.remove_xi(xi)
+                    st.rerun()
     
 
     
@@ -214,25 +240,30 @@ def live_auction():
         st.session_state.cumulative_deductions = {}
     if "player_data" not in st.session_state:
         st.session_state.player_data = {}
+    if "data_version" not in st.session_state:
+        # Incremented on every change so a prepared save is never stale
+        st.session_state.data_version = 0
 
-    # Save data to JSON
-    def save_data():
+    # Save data to JSON, only when requested
+    def save_data(compress=False):
         data = {
             "team_list": st.session_state.team_list,
             "budgets": st.session_state.budgets,
             "cumulative_deductions": st.session_state.cumulative_deductions,
             "player_data": st.session_state.player_data,
         }
-        return json.dumps(data)
+        return dump_json(data, compress=compress)
 
-    # Load data from JSON
+    # Load data from JSON (plain or gzip-compressed)
     def load_data(uploaded_file):
-        data = json.load(uploaded_file)
+        raw = uploaded_file.getvalue()
+        data = json.loads(gzip.decompress(raw) if raw[:2] == b"\x1f\x8b" else raw)
         st.session_state.team_list = data.get("team_list", [])
         st.session_state.budgets = data.get("budgets", {})
         st.session_state.cumulative_deductions = data.get("cumulative_deductions", {})
         st.session_state.player_data = data.get("player_data", {})
         st.session_state.setup_complete = True
+        st.session_state.data_version += 1
 
     # Inputs section
     if not st.session_state.setup_complete:
@@ -254,6 +285,7 @@ def live_auction():
                 st.session_state.cumulative_deductions = {team: 0 for team in team_inputs}
                 st.session_state.player_data = {team: [] for team in team_inputs}
                 st.session_state.setup_complete = True
+                st.session_state.data_version += 1
             else:
                 st.warning("Please fill in all team names before proceeding.")
     else:
@@ -280,6 +312,7 @@ def live_auction():
                         # Append player data and deduct budget
                         st.session_state.player_data[team_name].append({"name": player_name, "value": retention_value})
                         st.session_state.cumulative_deductions[team_name] += retention_value
+                        st.session_state.data_version += 1
                         st.session_state.budgets[team_name] -= retention_value
                         st.success(f"{player_name} added! Remaining budget for {team_name}: {st.session_state.budgets[team_name]} Cr/Million")
                     else:
@@ -292,9 +325,18 @@ def live_auction():
                     st.write(f"- {player['name']} ({player['value']} Cr/Million)")
 
     # Save and Load buttons
-    st.download_button("Save Data", save_data(), file_name="auction_data.json", mime="application/json")
-
-    uploaded_file = st.file_uploader("Load Data ", type="json")
+    compress_save = st.checkbox("Compress save file (gzip)", key="compress_save")
+    save_key = (compress_save, st.session_state.data_version)
+    if st.button("Prepare Save"):
+        with span("save_data"):
+            st.session_state["prepared_save"] = save_data(compress_save)
+        st.session_state["prepared_save_key"] = save_key
+    if st.session_state.get("prepared_save_key") == save_key:
+        file_name = "auction_data.json.gz" if compress_save else "auction_data.json"
+        mime = "application/gzip" if compress_save else "application/json"
+        st.download_button("Save Data", st.session_state["prepared_save"], file_name=file_name, mime=mime)
+
+    uploaded_file = st.file_uploader("Load Data ", type=["json", "gz"])
     if uploaded_file is not None:
         load_data(uploaded_file)
         st.success("Data loaded successfully! Rerun the page from the menu at right top of the page to see updated UI.")
@@ -313,6 +355,35 @@ def analysis_and_charts():
         )
     if selected == "Analysis and Charts":
         st.title("Analysis and Charts")
+
+        auction_list = st.session_state["auction_list_file_df"]
+        digest = st.session_state.get("auction_list_digest") if auction_list is not None else None
+        with span("analytics"):
+            analytics = get_analytics(digest, get_ledger().version, auction_list)
+        if analytics.sales.empty:
+            st.info("No sales recorded yet. Charts appear here once the live auction starts selling players.")
+            return
+        if auction_list is None:
+            st.caption("Upload the auction list on the Home page to break spend down by Specialism and Country.")
+
+        totals = analytics.totals()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Players Sold", totals["players"])
+        col2.metric("Total Spend (Lakhs)", f"{totals['spend']:,.0f}")
+        col3.metric("Average Price (Lakhs)", f"{totals['average']:,.1f}")
+        col4.metric("Median Price / Reserve", "-" if pd.isna(totals["median_multiple"]) else f"{totals['median_multiple']:.2f}x")
+
+        group_col = st.selectbox("Group spend by", analytics.group_columns, key="analysis_group")
+        spend = analytics.spend_by(group_col)
+        st.bar_chart(spend["Spend"])
+        st.dataframe(spend)
+
+        if analytics.has_multiples:
+            st.subheader("Price to Reserve Multiples")
+            st.dataframe(analytics.multiples_by(group_col))
+
+        st.subheader("Cumulative Spend over Auction Order")
+        st.line_chart(analytics.cumulative_spend())
     elif selected == "Settings":
         st.title("Settings")
 
@@ -333,15 +404,18 @@ selected = option_menu(
 
 )
 
-if selected == "Home":
-    st.title("Auc-Buddy: Your Auction Companion.")
-    home_page()
-elif selected == "My Teams":
-    my_teams()
-elif selected == "Live Auction":
-    live_auction()
-elif selected == "Analysis and Charts":
-    analysis_and_charts()
+with profiled(get_profiler(), selected):
+    if selected == "Home":
+        st.title("Auc-Buddy: Your Auction Companion.")
+        home_page()
+    elif selected == "My Teams":
+        my_teams()
+    elif selected == "Live Auction":
+        live_auction()
+    elif selected == "Analysis and Charts":
+        analysis_and_charts()
+
+profiler_panel()
 
 
 
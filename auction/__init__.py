@@ -0,0 +1 @@
+"""Auction core shared by the Streamlit apps (Try.py and One.py)."""
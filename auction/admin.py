@@ -0,0 +1,61 @@
+"""Admin sidebar panel for the rerun profiler, shared by Try.py and One.py.
+
+The panel is shown when the app is opened with ``?admin=1`` or started with
+``AUCTION_ADMIN=1``. Profiling stays off (and ``get_profiler()`` returns
+None) until it is switched on in the panel.
+"""
+import functools
+import os
+
+import streamlit as st
+
+from auction.profiling import Profiler, profiled
+
+# Reruns kept for the breakdown and percentiles
+PROFILE_RUNS = 50
+
+
+def admin_enabled():
+    return os.environ.get("AUCTION_ADMIN") == "1" or st.query_params.get("admin") == "1"
+
+
+def get_profiler():
+    """The session's profiler while profiling is on, otherwise None."""
+    return st.session_state.get("profiler")
+
+
+def profiled_rerun(label):
+    """Decorator that profiles a function as its own run, e.g. a fragment rerunning by itself."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled(get_profiler(), label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profiler_panel():
+    """Sidebar controls: switch profiling on/off, last runs by stage, p50/p95 and a JSON lines export."""
+    if not admin_enabled():
+        return
+    with st.sidebar.expander("Performance (admin)"):
+        enabled = st.toggle("Profile reruns", value=get_profiler() is not None, key="profile_reruns")
+        if not enabled:
+            st.session_state.pop("profiler", None)
+            return
+        if get_profiler() is None:
+            st.session_state["profiler"] = Profiler(PROFILE_RUNS)
+            st.caption("Profiling starts with the next rerun.")
+            return
+
+        profiler = get_profiler()
+        if not profiler.runs:
+            st.caption("No profiled reruns yet.")
+            return
+        st.caption(f"Last {len(profiler.runs)} reruns, newest first")
+        st.dataframe(profiler.runs_frame(), hide_index=True)
+        st.dataframe(profiler.stage_stats(), hide_index=True)
+        st.download_button("Export traces (JSONL)", profiler.export_jsonl(), file_name="auction_traces.jsonl", mime="application/jsonl")
+        if st.button("Clear traces"):
+            profiler.clear()
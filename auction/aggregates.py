@@ -0,0 +1,160 @@
+"""Per-team aggregates maintained incrementally as the auction runs.
+
+``TeamAggregates`` is a materialized view of the squads: spent, remaining
+purse, squad size, RTM uses, overseas players and counts per Specialism.
+Each sale updates it in O(1); pages read it instead of rebuilding frames
+from the sales on every render.
+"""
+from collections import Counter
+
+import pandas as pd
+
+HOME_COUNTRY = "India"
+
+SUMMARY_COLUMNS = ["Team", "Budget", "Spent", "Players", "Overseas", "RTM Used"]
+
+
+class TeamTotals:
+    """Running totals for one team."""
+
+    __slots__ = ("remaining", "spent", "squad_count", "rtm_count", "overseas_count", "specialisms")
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+        self.spent = 0
+        self.squad_count = 0
+        self.rtm_count = 0
+        self.overseas_count = 0
+        self.specialisms = Counter()
+
+
+class TeamAggregates:
+    """Materialized per-team view over the sales, joined with the player pool."""
+
+    def __init__(self, team_list, budgets, player_index=None):
+        self.team_list = list(team_list)
+        self.player_index = player_index
+        self.teams = {team: TeamTotals(budgets.get(team, 0)) for team in self.team_list}
+        self.version = 0
+        self._summary = None
+        self._rosters = {}
+
+    @classmethod
+    def from_sales(cls, team_list, budgets, sales, player_index=None):
+        """Builds the view from a ``SalesTable``, with spend, squad size and RTM use as column sums."""
+        aggregates = cls(team_list, {}, player_index)
+        for team, spent, squad_count, rtm_count in zip(sales.teams, sales.spend_by_team().tolist(), sales.squad_counts().tolist(), sales.rtm_counts().tolist()):
+            totals = aggregates._totals(team)
+            totals.spent, totals.squad_count, totals.rtm_count = spent, squad_count, rtm_count
+        if player_index is not None:
+            # Country and Specialism come from the pool, one lookup per sale
+            for team, player_id in sales.pairs():
+                totals = aggregates.teams[team]
+                country, specialism = aggregates._player_attributes(player_id)
+                totals.overseas_count += _is_overseas(country)
+                if specialism is not None:
+                    totals.specialisms[specialism] += 1
+        for team, budget in budgets.items():
+            aggregates._totals(team).remaining = budget
+        return aggregates
+
+    def copy(self):
+        """An independent copy of the totals (not the cached frames), e.g. to try out sales."""
+        copied = TeamAggregates(self.team_list, {}, self.player_index)
+        for team, totals in self.teams.items():
+            running = copied._totals(team)
+            running.remaining, running.spent, running.squad_count = totals.remaining, totals.spent, totals.squad_count
+            running.rtm_count, running.overseas_count = totals.rtm_count, totals.overseas_count
+            running.specialisms = Counter(totals.specialisms)
+        return copied
+
+    def record_sale(self, team, player_id, price, rtm=False):
+        """Adds a sale to ``team`` and deducts ``price`` from its purse."""
+        totals = self._add(team, player_id, price, rtm)
+        totals.remaining -= price
+        self._changed(team)
+
+    def remove_sale(self, team, player_id, price, rtm=False):
+        """Reverses ``record_sale`` (e.g. when a sale is undone)."""
+        totals = self.teams[team]
+        totals.spent -= price
+        totals.remaining += price
+        totals.squad_count -= 1
+        totals.rtm_count -= bool(rtm)
+        country, specialism = self._player_attributes(player_id)
+        totals.overseas_count -= _is_overseas(country)
+        if specialism is not None:
+            totals.specialisms[specialism] -= 1
+            if totals.specialisms[specialism] <= 0:
+                del totals.specialisms[specialism]
+        self._changed(team)
+
+    def set_budget(self, team, budget):
+        self._totals(team).remaining = budget
+        self._changed(team)
+
+    def team(self, team):
+        """``team``'s totals; raises ``KeyError`` for a team that isn't in the auction."""
+        return self.teams[team]
+
+    def is_overseas(self, player_id):
+        """True if the pool lists ``player_id`` under a country other than ``HOME_COUNTRY``."""
+        return _is_overseas(self._player_attributes(player_id)[0])
+
+    def summary_frame(self):
+        """One row per team; rebuilt only after a change."""
+        if self._summary is None:
+            self._summary = pd.DataFrame(
+                [
+                    (team, t.remaining, t.spent, t.squad_count, t.overseas_count, t.rtm_count)
+                    for team, t in self.teams.items()
+                ],
+                columns=SUMMARY_COLUMNS,
+            )
+        return self._summary
+
+    def roster_frame(self, team, sales):
+        """``team``'s roster from ``sales`` (a ``SalesTable``) joined with pool details, cached until the team changes."""
+        cached = self._rosters.get(team)
+        if cached is None:
+            roster = sales.roster(team)
+            if self.player_index is not None and len(roster):
+                details = [self._player_attributes(player_id) for player_id in roster["Player ID"]]
+                roster["Country"] = [country for country, _ in details]
+                roster["Specialism"] = [specialism for _, specialism in details]
+            cached = self._rosters[team] = roster
+        return cached
+
+    def _totals(self, team):
+        # Writes only: a sale or budget can name a team missing from team_list (e.g. in an old save file)
+        if team not in self.teams:
+            self.team_list.append(team)
+            self.teams[team] = TeamTotals(0)
+        return self.teams[team]
+
+    def _add(self, team, player_id, price, rtm):
+        totals = self._totals(team)
+        totals.spent += price
+        totals.squad_count += 1
+        totals.rtm_count += bool(rtm)
+        country, specialism = self._player_attributes(player_id)
+        totals.overseas_count += _is_overseas(country)
+        if specialism is not None:
+            totals.specialisms[specialism] += 1
+        return totals
+
+    def _changed(self, team):
+        self.version += 1
+        self._summary = None
+        self._rosters.pop(team, None)
+
+    def _player_attributes(self, player_id):
+        if self.player_index is None:
+            return None, None
+        country = self.player_index.value(player_id, "Country")
+        specialism = self.player_index.value(player_id, "Specialism")
+        return (None if pd.isna(country) else country), (None if pd.isna(specialism) else specialism)
+
+
+def _is_overseas(country):
+    return country is not None and str(country).strip().lower() != HOME_COUNTRY.lower()
@@ -0,0 +1,85 @@
+"""Spend analytics over the player pool and the sales ledger.
+
+``AuctionAnalytics`` joins the ledger's sales with the pool once and answers
+every chart with vectorized pandas groupbys, so an instance can be cached
+per ledger version and reused until the next sale.
+"""
+import numpy as np
+import pandas as pd
+
+from auction.ingest import normalize_columns
+
+SALE_COLUMNS = ["Seq", "Team", "Player ID", "Name", "Price", "RTM"]
+RESERVE_COLUMN = "Reserve_Price_Rs_Lakh"
+# Pool columns that spend can be grouped by, besides Team
+POOL_GROUP_COLUMNS = ["Specialism", "Country", "IPL_2025_Team"]
+
+
+class AuctionAnalytics:
+    """Sales joined with pool details, with cached aggregate frames."""
+
+    def __init__(self, sales_rows, pool_df=None):
+        sales = pd.DataFrame(sales_rows, columns=SALE_COLUMNS)
+        sales["Price"] = pd.to_numeric(sales["Price"], errors="coerce").fillna(0)
+        sales["RTM"] = sales["RTM"].astype(bool)
+        sales["Order"] = np.arange(1, len(sales) + 1)
+
+        if pool_df is not None:
+            # Shallow copy, so the session's pool keeps its own column names
+            pool = normalize_columns(pool_df.copy(deep=False))
+            details = [col for col in POOL_GROUP_COLUMNS + [RESERVE_COLUMN] if col in pool.columns]
+            pool = pool.drop_duplicates("List_Sr_No")[["List_Sr_No"] + details]
+            sales = sales.merge(pool, how="left", left_on="Player ID", right_on="List_Sr_No").drop(columns="List_Sr_No")
+            if RESERVE_COLUMN in sales.columns:
+                reserve = pd.to_numeric(sales[RESERVE_COLUMN], errors="coerce")
+                sales["Multiple"] = sales["Price"] / reserve.where(reserve > 0)
+        self.sales = sales
+        self._frames = {}
+
+    @property
+    def group_columns(self):
+        return ["Team"] + [col for col in POOL_GROUP_COLUMNS if col in self.sales.columns]
+
+    @property
+    def has_multiples(self):
+        return "Multiple" in self.sales.columns
+
+    def totals(self):
+        """Headline numbers: players sold, total spend, average price and median multiple."""
+        prices = self.sales["Price"].to_numpy()
+        median_multiple = self.sales["Multiple"].median() if self.has_multiples else np.nan
+        return {
+            "players": len(prices),
+            "spend": prices.sum(),
+            "average": prices.mean() if len(prices) else 0,
+            "median_multiple": median_multiple,
+        }
+
+    def spend_by(self, col):
+        """Spend, player count and average price per value of ``col``, highest spend first."""
+        return self._cached(("spend_by", col), lambda: (
+            self.sales.groupby(col, observed=True, dropna=False)["Price"]
+            .agg(Spend="sum", Players="count", Average="mean")
+            .sort_values("Spend", ascending=False)
+        ))
+
+    def multiples_by(self, col):
+        """Median, mean and maximum price-to-reserve multiple per value of ``col``."""
+        return self._cached(("multiples_by", col), lambda: (
+            self.sales.dropna(subset=["Multiple"])
+            .groupby(col, observed=True, dropna=False)["Multiple"]
+            .agg(Median="median", Mean="mean", Max="max")
+            .sort_values("Median", ascending=False)
+        ))
+
+    def cumulative_spend(self):
+        """Running spend per team (columns) after each sale in auction order (index)."""
+        return self._cached("cumulative_spend", lambda: (
+            self.sales.pivot_table(index="Order", columns="Team", values="Price", aggfunc="sum", fill_value=0)
+            .cumsum()
+        ))
+
+    def _cached(self, key, build):
+        if key not in self._frames:
+            self._frames[key] = build()
+        return self._frames[key]
@@ -0,0 +1,129 @@
+"""Bulk retentions and replays of recorded sales.
+
+A batch is a table of transactions (team, player ID, price, RTM and an
+optional name), uploaded as CSV/XLSX or typed into the Retention page.
+``validate_batch()`` checks every row against the pool and the sales so far
+in one vectorised pass, then runs the rows through the same
+``ConstraintEngine`` as a live bid, over a copy of the team totals that
+takes each accepted row in turn, so each row is judged as if every earlier
+row had been applied.
+``apply_batch()`` then records the whole batch through
+``AuctionEngine.sell_batch()`` in one step, or nothing if any row fails.
+"""
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+from auction.constraints import ConstraintEngine
+
+BATCH_COLUMNS = ["Team", "Player ID", "Price", "RTM", "Name"]
+
+# Header spellings accepted for each column, after lower-casing and joining words with "_"
+_ALIASES = {
+    "team": "Team", "team_name": "Team", "buyer": "Team",
+    "player_id": "Player ID", "playerid": "Player ID", "id": "Player ID", "list_sr_no": "Player ID",
+    "price": "Price", "final_price": "Price", "price_lakhs": "Price", "retention_price": "Price",
+    "rtm": "RTM",
+    "name": "Name", "player_name": "Name",
+}
+_TRUE = {"1", "true", "yes", "y", "t"}
+
+
+class BatchError(ValueError):
+    """Raised when a batch can't be read or has invalid rows; ``report`` flags each bad row."""
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report
+
+
+def read_transactions(data, file_extension):
+    """Parses CSV/XLSX bytes into a normalised transaction table."""
+    if file_extension == 'csv':
+        df = pd.read_csv(io.BytesIO(data))
+    elif file_extension == 'xlsx':
+        df = pd.read_excel(io.BytesIO(data))
+    else:
+        raise BatchError(f"Unsupported file type: {file_extension}")
+    return normalize_transactions(df)
+
+
+def normalize_transactions(df):
+    """Renames known headers to ``BATCH_COLUMNS`` and coerces their types; blank rows are dropped."""
+    renamed = {}
+    for col in df.columns:
+        key = re.sub(r"[^a-z0-9]+", "_", str(col).strip().lower()).strip("_")
+        if key in _ALIASES and _ALIASES[key] not in renamed.values():
+            renamed[col] = _ALIASES[key]
+    df = df.rename(columns=renamed)
+    missing = [col for col in ["Team", "Player ID", "Price"] if col not in df.columns]
+    if missing:
+        raise BatchError(f"Missing columns: {', '.join(missing)}")
+
+    df = df.dropna(how="all", subset=["Team", "Player ID", "Price"]).reset_index(drop=True)
+    batch = pd.DataFrame(index=df.index)
+    batch["Team"] = df["Team"].fillna("").astype(str).str.strip()
+    batch["Player ID"] = pd.to_numeric(df["Player ID"], errors="coerce").astype("Int64")
+    price = pd.to_numeric(df["Price"], errors="coerce")
+    # Prices are whole Lakhs in the app; keep them integers when the file agrees
+    whole = price.dropna()
+    batch["Price"] = price.astype("Int64") if (whole == whole.round()).all() else price
+    if "RTM" in df.columns:
+        batch["RTM"] = df["RTM"].fillna(False).astype(str).str.strip().str.lower().isin(_TRUE)
+    else:
+        batch["RTM"] = False
+    batch["Name"] = df["Name"].fillna("").astype(str).str.strip() if "Name" in df.columns else ""
+    return batch
+
+
+def validate_batch(engine, batch):
+    """``batch`` plus an ``Error`` column: empty for rows that can be applied, otherwise the first reason."""
+    batch = normalize_transactions(batch)
+    errors = pd.Series("", index=batch.index, dtype=object)
+
+    def flag(condition, reason):
+        errors[np.asarray(condition, dtype=bool) & (errors == "").to_numpy()] = reason
+
+    player_ids = batch["Player ID"]
+    flag(player_ids.isna(), "player ID is not a number")
+    flag(batch["Price"].isna() | (batch["Price"] < 0).fillna(False), "price must be a number of Lakhs")
+    flag(~batch["Team"].isin(engine.team_list), "unknown team")
+    if engine.has_pool:
+        flag(~player_ids.isin(engine.pool_df["List_Sr_No"]), "player ID is not in the auction list")
+    flag(player_ids.isin(engine.sales.sold_ids()), "player is already sold")
+    flag(player_ids.duplicated() & player_ids.notna(), "player appears earlier in this batch")
+
+    # Squad rules over the rows still valid, each judged after all the earlier ones
+    valid = batch[errors == ""]
+    if len(valid):
+        running = engine.aggregates.copy()
+        constraints = ConstraintEngine(running, engine.rules)
+        for row, team, player_id, price, rtm in zip(valid.index, valid["Team"], valid["Player ID"], valid["Price"], valid["RTM"]):
+            player_id = int(player_id)
+            violation = constraints.check(team, price, running.is_overseas(player_id))
+            if violation:
+                errors[row] = violation
+            else:
+                running.record_sale(team, player_id, price, rtm)
+
+    report = batch.copy()
+    report["Error"] = errors
+    return report
+
+
+def apply_batch(engine, batch):
+    """Validates ``batch`` and records all of it, or raises ``BatchError`` with the report and records nothing."""
+    report = validate_batch(engine, batch)
+    invalid = report["Error"] != ""
+    if invalid.any():
+        raise BatchError(f"{int(invalid.sum())} of {len(report)} rows can't be applied", report)
+    engine.sell_batch(zip(
+        report["Team"].tolist(),
+        report["Player ID"].tolist(),
+        report["Price"].tolist(),
+        report["RTM"].tolist(),
+        report["Name"].tolist(),
+    ))
+    return report
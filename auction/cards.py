@@ -0,0 +1,77 @@
+"""Primary-key index over the pool and cached "player card" records.
+
+The auction floor looks players up by ``List_Sr_No``. ``PlayerIndex`` maps
+each ID to its row position once per pool, and keeps the rendered card data
+(name, typed reserve price, display fields) in a bounded LRU so the next
+few scheduled players can be prepared before the auctioneer gets to them.
+"""
+from collections import namedtuple
+
+from auction.lru import LRUCache
+
+DISPLAY_COLUMNS = ['Country', 'Specialism', 'Test_caps', 'ODI_caps', 'T20_caps', 'IPL_2025_Team']
+
+PlayerCard = namedtuple("PlayerCard", ["player_id", "name", "reserve_price", "details", "row"])
+
+
+class PlayerIndex:
+    """Looks up pool rows and player cards by ``List_Sr_No``."""
+
+    def __init__(self, df, max_cards=64):
+        self.df = df
+        self._positions = {}
+        for pos, player_id in enumerate(df['List_Sr_No'].tolist()):
+            # Keep the first row for duplicated IDs, like a boolean-mask lookup would
+            self._positions.setdefault(player_id, pos)
+        self._cards = LRUCache(max_cards)
+        self._columns = {}
+
+    def __contains__(self, player_id):
+        return player_id in self._positions
+
+    def row(self, player_id):
+        """Returns the pool row for ``player_id``; raises KeyError if absent."""
+        if player_id not in self._positions:
+            raise KeyError(f"Player ID {player_id} is not in the auction list")
+        return self.df.iloc[self._positions[player_id]]
+
+    def value(self, player_id, col, default=None):
+        """Single field of a player's row, read from a cached column array."""
+        if col not in self._columns:
+            self._columns[col] = self.df[col].to_numpy() if col in self.df.columns else None
+        values = self._columns[col]
+        if values is None or player_id not in self._positions:
+            return default
+        return values[self._positions[player_id]]
+
+    def name(self, player_id):
+        """Display name as on the card, without building the card."""
+        return f"{self.value(player_id, 'First_Name', '')} {self.value(player_id, 'Surname', '')}".strip()
+
+    def card(self, player_id):
+        """Returns the cached PlayerCard for ``player_id``, building it on a miss."""
+        card = self._cards.get(player_id)
+        if card is None:
+            card = self._build_card(player_id)
+            self._cards.put(player_id, card)
+        return card
+
+    def prefetch(self, player_ids):
+        """Builds cards for players that are about to come up."""
+        for player_id in player_ids:
+            if player_id in self._positions and player_id not in self._cards:
+                self._cards.put(player_id, self._build_card(player_id))
+
+    def _build_card(self, player_id):
+        player_row = self.row(player_id)
+        player_name = f"{player_row.get('First_Name', '')} {player_row.get('Surname', '')}".strip()
+
+        # Use Reserve_Price_Rs_Lakh as the reserve price, handling potential NaN/string issues
+        try:
+            reserve_price = int(player_row.get('Reserve_Price_Rs_Lakh', 0))
+        except (ValueError, TypeError):
+            reserve_price = 0
+
+        display_cols = [col for col in DISPLAY_COLUMNS if col in player_row.index]
+        details = player_row[display_cols].to_frame().T
+        return PlayerCard(player_id, player_name, reserve_price, details, player_row)
@@ -0,0 +1,75 @@
+"""Squad-rule checks for live bids.
+
+Everything is derived from the incrementally maintained ``TeamAggregates``,
+so checking a bid is O(1) per team and pre-evaluating every team for the
+player on the floor is O(#teams).
+
+A team's maximum legal bid is its purse minus the money it must keep back
+to fill the rest of the minimum squad at the minimum price:
+
+    max_bid = remaining - min_bid * max(0, min_squad - (squad_count + 1))
+"""
+from collections import namedtuple
+
+SquadRules = namedtuple("SquadRules", ["min_squad", "max_squad", "max_overseas", "min_bid"])
+
+# Stands in for "no limit" on squad and overseas counts (fits the simulator's int32 arrays)
+UNLIMITED = 2**31 - 1
+
+# IPL mega-auction rules: 18-25 players, at most 8 overseas, 30 lakh base price; suggested at setup
+IPL_RULES = SquadRules(min_squad=18, max_squad=25, max_overseas=8, min_bid=30)
+
+# For auctions that never chose rules (e.g. resumed or loaded ones): only the purse limits a bid
+DEFAULT_RULES = SquadRules(min_squad=0, max_squad=UNLIMITED, max_overseas=UNLIMITED, min_bid=0)
+
+TeamEligibility = namedtuple("TeamEligibility", ["team", "eligible", "max_bid", "squad_slots", "overseas_slots", "reason"])
+
+
+class ConstraintEngine:
+    """Evaluates bids against squad rules using a ``TeamAggregates`` view."""
+
+    def __init__(self, aggregates, rules=DEFAULT_RULES):
+        self.aggregates = aggregates
+        self.rules = rules
+
+    def max_bid(self, team):
+        totals = self.aggregates.team(team)
+        still_needed = max(0, self.rules.min_squad - (totals.squad_count + 1))
+        return totals.remaining - self.rules.min_bid * still_needed
+
+    def squad_slots_left(self, team):
+        return self.rules.max_squad - self.aggregates.team(team).squad_count
+
+    def overseas_slots_left(self, team):
+        return self.rules.max_overseas - self.aggregates.team(team).overseas_count
+
+    def check(self, team, price, overseas=False):
+        """Returns the reason ``team`` can't buy at ``price``, or None if the bid is legal."""
+        if team not in self.aggregates.teams:
+            return f"{team} is not a team in this auction"
+        if self.squad_slots_left(team) <= 0:
+            return f"squad is full ({self.rules.max_squad} players)"
+        if overseas and self.overseas_slots_left(team) <= 0:
+            return f"no overseas slots left ({self.rules.max_overseas} max)"
+        max_bid = self.max_bid(team)
+        if price > max_bid:
+            remaining = self.aggregates.team(team).remaining
+            if price > remaining:
+                return f"not enough budget ({remaining} Lakhs left)"
+            return f"maximum bid is {max_bid} Lakhs to keep enough purse for a {self.rules.min_squad}-player squad"
+        return None
+
+    def evaluate(self, price, overseas=False):
+        """Eligibility of every team for a player at ``price``."""
+        return [
+            TeamEligibility(
+                team,
+                reason is None,
+                self.max_bid(team),
+                self.squad_slots_left(team),
+                self.overseas_slots_left(team),
+                reason or "",
+            )
+            for team in self.aggregates.team_list
+            for reason in [self.check(team, price, overseas)]
+        ]
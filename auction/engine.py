@@ -0,0 +1,416 @@
+"""Headless auction engine behind the Try.py pages.
+
+``AuctionEngine`` owns the auction state (teams, budgets, sales, unsold
+list, current player) and every derived index over it, and exposes the
+auctioneer's actions as plain methods. It has no Streamlit dependency, so
+the same code path the app runs can be driven from scripts and
+benchmarks (see ``benchmarks/``). The app keeps one engine per session and
+only renders it.
+"""
+import threading
+
+from auction.aggregates import TeamAggregates
+from auction.cards import PlayerIndex
+from auction.constraints import DEFAULT_RULES, ConstraintEngine, SquadRules
+from auction.history import AuctionHistory, advance_event, budget_event, sale_event, unsold_event
+from auction.pool import AuctionPool
+from auction.sales import SalesTable
+from auction.search import NameSearch
+from auction.snapshot import export, load_snapshot
+
+
+class SaleError(ValueError):
+    """Raised when a sale breaks the squad rules or a result can't be recorded; the message says why."""
+
+
+class AuctionEngine:
+    """Auction state plus the pool, card and per-team indexes kept in step with it."""
+
+    def __init__(self, pool_df=None, ledger=None, rules=DEFAULT_RULES, lock=None):
+        self.pool_df = pool_df
+        self.ledger = ledger
+        self.rules = rules
+        # Held while the shared containers change, so readers on other threads see whole sales
+        self.lock = lock if lock is not None else threading.RLock()
+        self.team_list = []
+        self.budgets = {}
+        # Every sale, as columns; ``player_data`` is the save-file view of it
+        self.sales = SalesTable(resolve_name=self._pool_name)
+        self.total_budget = 0
+        # Player IDs (1-based) of players who went unsold
+        self.unsold_players = []
+        # Player ID (1-based index) currently being auctioned
+        self.current_player_id = None
+        # Incremented on every change to the auction state
+        self.version = 0
+        # Undo/redo steps since the state was last started, loaded or replaced
+        self.history = AuctionHistory()
+        self._pool = None
+        self._player_index = None
+        self._name_search = None
+        self._aggregates = None
+        self._export = (None, None)
+
+    # --- Derived indexes, rebuilt lazily after the pool or the whole state is replaced ---
+
+    @property
+    def has_pool(self):
+        return self.pool_df is not None
+
+    @property
+    def player_index(self):
+        """List_Sr_No index and player card cache for the current pool."""
+        if self._player_index is None and self.pool_df is not None:
+            self._player_index = PlayerIndex(self.pool_df)
+        return self._player_index
+
+    @property
+    def name_search(self):
+        """Trigram name index for player search, built on first use."""
+        if self._name_search is None and self.pool_df is not None:
+            self._name_search = NameSearch.from_pool(self.pool_df)
+        return self._name_search
+
+    @property
+    def pool(self):
+        """Incremental sold/unsold index over the pool."""
+        if self._pool is None and self.pool_df is not None:
+            self._pool = AuctionPool.from_state(self.pool_df, self.sales.sold_ids().tolist(), self.unsold_players)
+        return self._pool
+
+    @property
+    def aggregates(self):
+        """Per-team spent/remaining/squad view, updated on every sale."""
+        if self._aggregates is None:
+            self._aggregates = TeamAggregates.from_sales(self.team_list, self.budgets, self.sales, self.player_index)
+        return self._aggregates
+
+    @property
+    def player_data(self):
+        """``{team: [{"Player ID", "Name", "Price", "RTM"}, ...]}`` as in save files; read-only."""
+        return self.sales.to_player_data()
+
+    @property
+    def constraints(self):
+        return ConstraintEngine(self.aggregates, self.rules)
+
+    def state(self):
+        """The auction state as saved to files and the ledger."""
+        return self.live_state() | {"player_data": self.player_data}
+
+    def live_state(self):
+        """``state()`` without ``player_data``, which is rebuilt from every sale; shared with spectators on each bid."""
+        return {
+            "team_list": self.team_list,
+            "budgets": self.budgets,
+            "total_budget": self.total_budget,
+            "unsold_players": self.unsold_players,
+            "current_player_id": self.current_player_id,
+        }
+
+    # --- Setup ---
+
+    def set_pool(self, pool_df):
+        """Switches to a new player pool and puts its first player on the floor."""
+        # Sales made so far keep the names the old pool gave them
+        self.sales.set_resolver(None)
+        self.pool_df = pool_df
+        self._reset_indexes()
+        self.sales.set_resolver(self._pool_name)
+        self._set_current(1)
+        self.history.clear()
+        self._changed()
+
+    def start(self, team_list, total_budget, rules=None):
+        """Starts a fresh auction for ``team_list``, each with ``total_budget``."""
+        if rules is not None:
+            self.rules = rules
+        with self.lock:
+            self.team_list = list(team_list)
+            self.budgets = {team: total_budget for team in self.team_list}
+            self.sales = SalesTable(self.team_list, self._pool_name)
+            self.total_budget = total_budget
+            self.unsold_players = []
+        self._reset_indexes()
+        self.history.clear()
+        if self.ledger is not None:
+            self.ledger.start(self.team_list, total_budget, self.current_player_id)
+            self.ledger.set_squad_rules(self.rules._asdict())
+        self._changed()
+
+    def apply_state(self, state):
+        """Replaces the auction state, e.g. when resuming from the ledger or a save file."""
+        with self.lock:
+            self.team_list = state["team_list"]
+            self.budgets = state["budgets"]
+            self.sales = SalesTable.from_player_data(state["player_data"], state["team_list"], self._pool_name)
+            self.total_budget = state["total_budget"]
+            self.unsold_players = state["unsold_players"]
+            self.current_player_id = state["current_player_id"]
+        # Derived indexes are rebuilt in one pass from the new state
+        self._pool = None
+        self._aggregates = None
+        self._build_indexes()
+        self.history.clear()
+        self._changed()
+
+    def resume(self):
+        """Continues the auction stored in the ledger."""
+        self.rules = SquadRules(**(self.ledger.squad_rules() or DEFAULT_RULES._asdict()))
+        self.apply_state(self.ledger.load_state())
+
+    def load_snapshot(self, data):
+        """Applies a save file; raises ``SnapshotError`` and leaves the state alone if it is invalid."""
+        state = load_snapshot(data)
+        self.apply_state(state)
+        if self.ledger is not None:
+            # The ledger now continues from the loaded state
+            self.ledger.import_state(state)
+            self.ledger.set_squad_rules(self.rules._asdict())
+        return state
+
+    def export(self, export_format):
+        """Returns ``(data, file_name, mime)``, serialized once per format and state version."""
+        key, data = self._export
+        if key != (export_format, self.version):
+            data = export(self.state(), export_format)
+            self._export = ((export_format, self.version), data)
+        return data
+
+    def has_export(self, export_format):
+        return self._export[0] == (export_format, self.version)
+
+    # --- Auctioneer actions ---
+
+    def next_player_id(self, current_id):
+        # Sold/unsold bookkeeping is kept incrementally in the AuctionPool, so this is O(log n)
+        return self.pool.next_player(current_id)
+
+    def advance(self, player_id=None):
+        """Moves to ``player_id`` (or the next scheduled player); returns None when the pool is done."""
+        previous_id = self.current_player_id
+        if player_id is not None:
+            next_id = player_id
+        elif self.pool_df is not None:
+            # Start at ID 1 if not started
+            next_id = 1 if previous_id is None else self.next_player_id(previous_id)
+        else:
+            next_id = previous_id
+        self._set_current(next_id)
+        self.history.record_advance(advance_event(previous_id, next_id))
+        self._changed()
+        return self.current_player_id
+
+    def clear_current(self):
+        """Takes the current player off the floor (e.g. when their row can't be read)."""
+        self._set_current(None)
+        self._changed()
+
+    def is_overseas(self, player_id):
+        return self.aggregates.is_overseas(player_id)
+
+    def sell(self, player_id, team, price, rtm=False, name=None):
+        """Records a sale to ``team``; raises ``SaleError`` if the player is already sold or it breaks the squad rules."""
+        if player_id is not None and self.is_sold(player_id):
+            raise SaleError(f"player {player_id} is already sold")
+        violation = self.constraints.check(team, price, self.is_overseas(player_id))
+        if violation:
+            raise SaleError(violation)
+        if name is None:
+            index = self.player_index
+            name = index.card(player_id).name if index is not None and player_id in index else ""
+        event = sale_event(team, player_id, price, rtm, name, *self._unsold_entry(player_id))
+        sale = self._add_sale(event)
+        self.history.record(f"Sale of {name or f'player {player_id}'} to {team}", [event])
+        self._changed()
+        return sale
+
+    def sell_batch(self, sales):
+        """Records many ``(team, player_id, price, rtm, name)`` sales in one step, without rule checks.
+
+        Callers validate first (see ``auction.batch``); the ledger gets the
+        whole batch in one transaction before any in-memory state changes.
+        """
+        records = [(team, player_id, price, bool(rtm), name or self._pool_name(player_id) or "") for team, player_id, price, rtm, name in sales]
+        if not records:
+            return []
+        pool = self.pool
+        aggregates = self.aggregates
+        # Unsold positions as if the sales were made one by one, so undoing them newest first restores the list
+        unsold = list(self.unsold_players)
+        unsold_seqs = self.ledger.unsold_seqs(set(unsold) & {player_id for _, player_id, _, _, _ in records}) if self.ledger is not None else {}
+        events = []
+        for team, player_id, price, rtm, name in records:
+            position = unsold.index(player_id) if player_id in unsold else None
+            if position is not None:
+                del unsold[position]
+            events.append(sale_event(team, player_id, price, rtm, name, position, unsold_seqs.get(player_id)))
+        sold_ids = {player_id for _, player_id, _, _, _ in records}
+        if self.ledger is not None:
+            self.ledger.record_sales([(team, player_id, name, price, rtm) for team, player_id, price, rtm, name in records])
+        with self.lock:
+            first_row = len(self.sales)
+            self.sales.extend(records)
+            for team, _, price, _, _ in records:
+                self.budgets[team] = self.budgets.get(team, 0) - price
+            self.unsold_players[:] = [player_id for player_id in self.unsold_players if player_id not in sold_ids]
+        for team, player_id, price, rtm, _ in records:
+            if pool is not None:
+                pool.mark_sold(player_id)
+            aggregates.record_sale(team, player_id, price, rtm)
+        # The whole batch is undone in one step
+        self.history.record(f"Batch of {len(records)} sales", events)
+        self._changed()
+        return [self.sales.sale(row) for row in range(first_row, len(self.sales))]
+
+    def is_unsold(self, player_id):
+        pool = self.pool
+        return pool.is_unsold(player_id) if pool is not None else player_id in self.unsold_players
+
+    def is_sold(self, player_id):
+        pool = self.pool
+        if pool is not None:
+            return pool.is_sold(player_id)
+        return player_id in self.sales.sold_ids()
+
+    def mark_unsold(self, player_id):
+        """Adds the player to the accelerated-round list (once); raises ``SaleError`` if they were sold."""
+        if self.is_sold(player_id):
+            raise SaleError(f"player {player_id} is already sold")
+        if self.is_unsold(player_id):
+            return
+        self._add_unsold(player_id)
+        self.history.record(f"Player {player_id} unsold", [unsold_event(player_id)])
+        self._changed()
+
+    def set_budget(self, team, budget):
+        """Corrects ``team``'s remaining purse by hand."""
+        event = budget_event(team, self.budgets.get(team, 0), budget)
+        self._set_budget(team, budget)
+        self.history.record(f"Budget of {team} set to {budget}", [event])
+        self._changed()
+
+    # --- Undo/redo ---
+
+    def undo(self):
+        """Reverses the newest step; returns its label, or None if there was nothing to undo."""
+        step = self.history.pop_undo()
+        if step is None:
+            return None
+        for event in reversed(step.events):
+            if event.kind == "sale":
+                self._remove_sale(event)
+            elif event.kind == "unsold":
+                self._remove_unsold(event.player_id)
+            elif event.kind == "advance":
+                self._set_current(event.before)
+            else:
+                self._set_budget(event.team, event.before)
+        self._changed()
+        return step.label
+
+    def redo(self):
+        """Applies the most recently undone step again; returns its label, or None if there was none."""
+        step = self.history.pop_redo()
+        if step is None:
+            return None
+        for event in step.events:
+            if event.kind == "sale":
+                self._add_sale(event)
+            elif event.kind == "unsold":
+                self._add_unsold(event.player_id)
+            elif event.kind == "advance":
+                self._set_current(event.after)
+            else:
+                self._set_budget(event.team, event.after)
+        self._changed()
+        return step.label
+
+    # --- State changes shared by actions, undo and redo ---
+
+    def _add_sale(self, event):
+        team, player_id, price, rtm = event.team, event.player_id, event.price, event.rtm
+        pool = self.pool
+        with self.lock:
+            row = self.sales.append(team, player_id, price, rtm, event.name)
+            self.budgets[team] = self.budgets.get(team, 0) - price
+            # Remove from unsold list if present
+            if event.before is not None:
+                self.unsold_players.remove(player_id)
+        if pool is not None:
+            pool.mark_sold(player_id)
+        self.aggregates.record_sale(team, player_id, price, rtm)
+        if self.ledger is not None:
+            self.ledger.record_sale(team, player_id, event.name, price, rtm)
+        return self.sales.sale(row)
+
+    def _remove_sale(self, event):
+        team, player_id, price = event.team, event.player_id, event.price
+        pool = self.pool
+        with self.lock:
+            # Steps are undone newest first, so this is the team's last sale
+            self.sales.remove(team, player_id)
+            self.budgets[team] += price
+            # Back on the unsold list where they were
+            if event.before is not None:
+                self.unsold_players.insert(event.before, player_id)
+        if pool is not None:
+            # Sales loaded from a save file may repeat a player; they stay sold until the last one goes
+            if player_id not in self.sales.sold_ids():
+                pool.release(player_id)
+            if event.before is not None:
+                pool.mark_unsold(player_id, event.before)
+        self.aggregates.remove_sale(team, player_id, price, event.rtm)
+        if self.ledger is not None:
+            self.ledger.remove_sale(team, player_id, price, unsold=event.before is not None, unsold_seq=event.after)
+
+    def _unsold_entry(self, player_id):
+        # (position in the unsold list, ledger sequence number) for a sale's undo
+        if not self.is_unsold(player_id):
+            return None, None
+        seq = self.ledger.unsold_seqs([player_id]).get(player_id) if self.ledger is not None else None
+        return self.unsold_players.index(player_id), seq
+
+    def _add_unsold(self, player_id):
+        with self.lock:
+            self.unsold_players.append(player_id)
+        if self.pool is not None:
+            self.pool.mark_unsold(player_id)
+        if self.ledger is not None:
+            self.ledger.record_unsold(player_id)
+
+    def _remove_unsold(self, player_id):
+        with self.lock:
+            self.unsold_players.remove(player_id)
+        if self.pool is not None:
+            self.pool.unmark_unsold(player_id)
+        if self.ledger is not None:
+            self.ledger.remove_unsold(player_id)
+
+    def _set_current(self, player_id):
+        self.current_player_id = player_id
+        if self.ledger is not None:
+            self.ledger.set_current_player(player_id)
+
+    def _set_budget(self, team, budget):
+        with self.lock:
+            self.budgets[team] = budget
+        self.aggregates.set_budget(team, budget)
+        if self.ledger is not None:
+            self.ledger.set_budget(team, budget)
+
+    def _pool_name(self, player_id):
+        index = self.player_index
+        return index.name(player_id) if index is not None and player_id in index else None
+
+    def _build_indexes(self):
+        return self.pool, self.aggregates
+
+    def _reset_indexes(self):
+        self._pool = None
+        self._player_index = None
+        self._name_search = None
+        self._aggregates = None
+
+    def _changed(self):
+        self.version += 1
@@ -0,0 +1,88 @@
+"""Filter engine built once per uploaded pool.
+
+Every column is factorized into integer category codes with its distinct
+values precomputed (in order of first appearance, like ``unique()``). Low
+cardinality columns such as Country, Specialism or IPL_2025_Team also get a
+packed bitmap per value, so combining filters is a handful of bitwise ANDs
+over ``n / 8`` bytes instead of building a fresh boolean mask per filter.
+Numeric columns (caps, reserve price) support inclusive range filters.
+"""
+import numpy as np
+import pandas as pd
+
+
+class FilterEngine:
+    """Precomputed equality and range filters over a pool DataFrame."""
+
+    def __init__(self, df, max_bitmap_values=256):
+        self.df = df
+        self.size = len(df)
+        self._codes = {}
+        self._values = {}
+        self._lookup = {}
+        self._bitmaps = {}
+        self._numeric = {}
+
+        for col in df.columns:
+            series = df[col]
+            codes, uniques = pd.factorize(series)
+            values = uniques.tolist()
+            self._codes[col] = codes
+            self._values[col] = values
+            self._lookup[col] = {value: code for code, value in enumerate(values)}
+            if len(values) <= max_bitmap_values:
+                self._bitmaps[col] = [np.packbits(codes == code) for code in range(len(values))]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                self._numeric[col] = series.to_numpy(dtype="float64", na_value=np.nan)
+
+    @property
+    def numeric_columns(self):
+        return list(self._numeric)
+
+    def distinct_values(self, col):
+        """Non-null distinct values of ``col`` in order of first appearance."""
+        return self._values[col]
+
+    def bounds(self, col):
+        """Returns ``(min, max)`` of a numeric column, ignoring missing values."""
+        values = self._numeric[col]
+        if np.isnan(values).all():
+            return (0, 0)
+        return (np.nanmin(values), np.nanmax(values))
+
+    def mask(self, equals=None, ranges=None):
+        """Boolean row mask for equality and ``{col: (low, high)}`` range filters.
+
+        ``equals`` is a ``{col: value}`` dict or a list of ``(col, value)``
+        pairs; repeating a column with different values matches nothing.
+        """
+        if isinstance(equals, dict):
+            equals = equals.items()
+        packed = None
+        for col, value in equals or ():
+            bitmap = self._value_bitmap(col, value)
+            packed = bitmap if packed is None else packed & bitmap
+
+        if packed is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            mask = np.unpackbits(packed, count=self.size).view(bool)
+
+        for col, (low, high) in (ranges or {}).items():
+            values = self._numeric[col]
+            mask &= (values >= low) & (values <= high)
+        return mask
+
+    def select(self, equals=None, ranges=None):
+        """Rows of the pool matching all filters (the full pool when there are none)."""
+        if not equals and not ranges:
+            return self.df
+        return self.df.iloc[np.flatnonzero(self.mask(equals, ranges))]
+
+    def _value_bitmap(self, col, value):
+        code = self._lookup[col].get(value)
+        if code is None:
+            return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        if col in self._bitmaps:
+            return self._bitmaps[col][code]
+        return np.packbits(self._codes[col] == code)
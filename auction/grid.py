@@ -0,0 +1,109 @@
+"""Windowed grids that send one page of rows to the browser.
+
+``WindowedGrid`` keeps a pool (or roster) DataFrame on the server and hands
+out pages of it: sorting is an argsort per column computed once, filtering
+is a boolean mask applied to that order, and a page is an ``iloc`` of at
+most ``page_size`` rows. Pages are indexed by ``List_Sr_No`` (or another key
+column), so a row keeps its identity whatever the sort, filter or page.
+``windowed_grid()`` renders one with paging controls in Streamlit.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+class WindowedGrid:
+    """Sorted, filtered, paged access to a DataFrame by row position."""
+
+    def __init__(self, df, key_column="List_Sr_No"):
+        self.df = df
+        self.key_column = key_column
+        if key_column in df.columns:
+            self.keys = df[key_column].to_numpy()
+            self.columns = [col for col in df.columns if col != key_column]
+        else:
+            # Same 1-based numbering that ingestion gives a pool without List_Sr_No
+            self.keys = np.arange(1, len(df) + 1)
+            self.columns = list(df.columns)
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def order(self, sort_by=None, ascending=True):
+        """Row positions sorted by ``sort_by`` (stable, missing values last); cached per column and direction."""
+        cache_key = (sort_by, ascending)
+        if cache_key not in self._orders:
+            if sort_by is None:
+                positions = np.arange(len(self.df))
+            else:
+                values = self.df[sort_by].reset_index(drop=True)
+                positions = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+            self._orders[cache_key] = positions
+        return self._orders[cache_key]
+
+    def rows(self, mask=None, sort_by=None, ascending=True):
+        """Positions of the rows matching ``mask`` (a boolean array over the pool), in sort order."""
+        positions = self.order(sort_by, ascending)
+        return positions if mask is None else positions[mask[positions]]
+
+    def page(self, positions, page, page_size):
+        """The ``page``-th window of ``positions`` as a DataFrame indexed by the key column."""
+        window = positions[page * page_size:(page + 1) * page_size]
+        frame = self.df.iloc[window][self.columns]
+        frame.index = pd.Index(self.keys[window], name=self.key_column)
+        return frame
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def windowed_grid(grid, key, mask=None, editor=False):
+    """Renders one page of ``grid`` with sort and paging controls; returns the page (edited, if ``editor``)."""
+    import streamlit as st
+
+    unsorted = "(list order)"
+    col_sort, col_desc, col_size = st.columns([3, 1, 1])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [unsorted] + grid.columns, key=f"{key}_sort")
+    with col_desc:
+        descending = st.toggle("Descending", key=f"{key}_desc")
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    positions = grid.rows(mask, None if sort_by == unsorted else sort_by, not descending)
+    pages = page_count(len(positions), page_size)
+
+    # A different filter, sort or page size starts again from the first page
+    page_key = f"{key}_page"
+    signature = (
+        None if mask is None else hashlib.blake2b(np.packbits(mask).tobytes(), digest_size=8).hexdigest(),
+        sort_by, descending, page_size,
+    )
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[page_key] = 0
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+
+    frame = grid.page(positions, page, page_size)
+    if editor:
+        frame = st.data_editor(frame, key=f"{key}_editor_{page}")
+    else:
+        st.dataframe(frame)
+
+    def turn(step):
+        st.session_state[page_key] = min(max(page + step, 0), pages - 1)
+
+    col_prev, col_info, col_next = st.columns([1, 4, 1])
+    with col_prev:
+        st.button("◀ Previous", key=f"{key}_prev", disabled=page == 0, on_click=turn, args=(-1,))
+    with col_info:
+        first = page * page_size + 1 if len(positions) else 0
+        st.caption(f"Rows {first}–{min((page + 1) * page_size, len(positions))} of {len(positions):,} · page {page + 1} of {pages}")
+    with col_next:
+        st.button("Next ▶", key=f"{key}_next", disabled=page >= pages - 1, on_click=turn, args=(1,))
+    return frame
@@ -0,0 +1,92 @@
+"""Undo/redo of auction actions.
+
+Every action the engine performs is recorded as a small event holding only
+what changed: the sale, the unsold mark, the player on the floor before and
+after, or a team's budget before and after. Undo applies the inverse of the
+newest step and redo applies it again, touching just the entries involved,
+so neither copies the auction state. Both stacks are bounded deques, so a
+full-length auction keeps at most ``max_steps`` steps in memory.
+
+Moving on from the player who was just sold or marked unsold belongs to the
+same step, so one undo of "Finalize and Move to Next Player" reverses the
+result and puts the player back on the floor.
+"""
+from collections import deque, namedtuple
+
+# kind is "sale", "unsold", "advance" or "budget". For a sale ``before`` is
+# the player's position in the unsold list (None if they weren't on it) and
+# ``after`` the ledger's sequence number for that unsold entry, so undo puts
+# them back where they were; for "advance" and "budget" they hold the player
+# on the floor / budget either side of the change.
+HistoryEvent = namedtuple("HistoryEvent", ["kind", "team", "player_id", "price", "rtm", "name", "before", "after"])
+
+HistoryStep = namedtuple("HistoryStep", ["label", "events"])
+
+DEFAULT_MAX_STEPS = 200
+
+
+def sale_event(team, player_id, price, rtm, name, unsold_position=None, unsold_seq=None):
+    return HistoryEvent("sale", team, player_id, price, bool(rtm), name, unsold_position, unsold_seq)
+
+
+def unsold_event(player_id):
+    return HistoryEvent("unsold", None, player_id, None, None, None, None, None)
+
+
+def advance_event(before, after):
+    return HistoryEvent("advance", None, None, None, None, None, before, after)
+
+
+def budget_event(team, before, after):
+    return HistoryEvent("budget", team, None, None, None, None, before, after)
+
+
+class AuctionHistory:
+    """Bounded undo and redo stacks of ``HistoryStep``s."""
+
+    def __init__(self, max_steps=DEFAULT_MAX_STEPS):
+        self._undo = deque(maxlen=max_steps)
+        self._redo = deque(maxlen=max_steps)
+
+    def __len__(self):
+        return len(self._undo)
+
+    def record(self, label, events):
+        """Adds a new step; anything that could have been redone is dropped."""
+        self._undo.append(HistoryStep(label, list(events)))
+        self._redo.clear()
+
+    def record_advance(self, event):
+        """Adds a move to another player, joining it to the result just recorded for the player it leaves."""
+        if self._undo and not self._redo:
+            last = self._undo[-1].events[-1]
+            if last.kind in ("sale", "unsold") and last.player_id == event.before:
+                self._undo[-1].events.append(event)
+                return
+        self.record(f"Move to player {event.after}", [event])
+
+    def undo_label(self):
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self):
+        return self._redo[-1].label if self._redo else None
+
+    def pop_undo(self):
+        """The newest step, moved onto the redo stack; None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step
+
+    def pop_redo(self):
+        """The most recently undone step, moved back onto the undo stack; None if there is none."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,317 @@
+"""Player pool ingestion keyed by a hash of the uploaded file's contents.
+
+``st.file_uploader`` hands back the same file on every rerun, so parsing is
+done once per distinct file and later reruns get the cached DataFrame.
+
+Files are read in chunks of ``CHUNK_ROWS`` rows: CSV through
+``pd.read_csv(chunksize=...)`` and XLSX by streaming rows from openpyxl in
+read-only mode. Each chunk gets the compact pool dtypes straight away, so
+the raw text of a large list is never held as a whole and peak memory stays
+close to the size of the finished frame. Every sheet of a workbook is read,
+and several files (or sheets) are parsed in parallel in a process pool,
+then merged into one pool.
+"""
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from auction.lru import LRUCache
+
+# Columns from the official auction list that get typed dtypes on ingestion
+NUMERIC_COLUMNS = ['Test_caps', 'ODI_caps', 'T20_caps', 'Reserve_Price_Rs_Lakh']
+CATEGORY_COLUMNS = ['Country', 'Specialism', 'IPL_2025_Team']
+
+CHUNK_ROWS = 50000
+# Below this much input, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+def file_digest(data):
+    """Returns the SHA-256 hex digest of the raw upload bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def clean_column_names(columns):
+    """Replaces spaces with underscores and removes special characters."""
+    return pd.Index(columns).astype(str).str.strip().str.replace('[^A-Za-z0-9_]+', '', regex=True).str.replace(' ', '_')
+
+
+def normalize_columns(df):
+    """Cleans up column names and makes sure a List_Sr_No column exists."""
+    df.columns = clean_column_names(df.columns)
+
+    # Add a List_Sr_No column if it doesn't exist (useful for indexing)
+    if 'List_Sr_No' not in df.columns:
+        df.insert(0, 'List_Sr_No', range(1, 1 + len(df)))
+    return df
+
+
+def apply_pool_dtypes(df):
+    """Gives the well-known pool columns compact, typed dtypes."""
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            if values.notna().all() and (values % 1 == 0).all():
+                values = pd.to_numeric(values.astype('int64'), downcast='integer')
+            df[col] = values
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def pool_digest(files):
+    """Digest of one or more ``(name, data)`` uploads; a single file keeps its own digest."""
+    digests = [file_digest(data) for _, data in files]
+    if len(digests) == 1:
+        return digests[0]
+    return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+
+def read_pool(data, file_extension, normalize=True, progress=None):
+    """Parses raw CSV/XLSX bytes into a player pool DataFrame."""
+    return read_pools([("", data)], file_extension, normalize, progress)
+
+
+def read_pools(files, file_extension, normalize=True, progress=None, max_workers=None):
+    """Parses and merges ``(name, data)`` uploads into one pool.
+
+    ``progress(fraction, text)`` is called as parts finish. With more than
+    one part and enough data, parts are parsed in spawned worker processes.
+
+    Sheets whose columns differ from the first part's (notes, summaries)
+    are skipped; a CSV file that differs raises ``ValueError``. When
+    parts number their players from the same ``List_Sr_No`` values, each
+    later part's IDs are shifted past the ones before it.
+    """
+    if file_extension not in ('csv', 'xlsx'):
+        raise ValueError(f"Unsupported file type: {file_extension}")
+    tasks = [(name, data, sheet) for name, data in files for sheet in _sheet_names(data, file_extension)]
+    report = progress or (lambda fraction, text: None)
+
+    if len(tasks) > 1 and sum(len(data) for _, data in files) >= PARALLEL_MIN_BYTES:
+        parts = [None] * len(tasks)
+        with _make_executor(max_workers, len(tasks)) as executor:
+            futures = {executor.submit(_read_part, data, file_extension, sheet, normalize): i for i, (_, data, sheet) in enumerate(tasks)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                parts[i] = future.result()
+                report(done / len(tasks), f"Parsed {_part_label(tasks[i])} ({done}/{len(tasks)})")
+    else:
+        parts = []
+        for i, (_, data, sheet) in enumerate(tasks):
+            part_progress = lambda fraction, i=i: report((i + fraction) / len(tasks), f"Parsing {_part_label(tasks[i])}")
+            parts.append(_read_part(data, file_extension, sheet, normalize, part_progress))
+
+    parts = _matching_parts(tasks, parts)
+    if normalize:
+        parts = _unique_ids(parts)
+    df = _merge_chunks(parts)
+    if normalize and 'List_Sr_No' not in df.columns:
+        df.insert(0, 'List_Sr_No', range(1, 1 + len(df)))
+    report(1.0, f"Parsed {len(df)} players")
+    return df
+
+
+def _matching_parts(tasks, parts):
+    reference = None
+    kept = []
+    used_files = set()
+    for (name, _, sheet), part in zip(tasks, parts):
+        if not len(part.columns):
+            continue
+        if reference is None:
+            reference = set(part.columns)
+        elif set(part.columns) != reference:
+            if sheet is None:
+                raise ValueError(f"The columns of {name or 'a file'} don't match the first file's")
+            continue
+        kept.append(part)
+        used_files.add(name)
+    unused = [name for name in dict.fromkeys(name for name, _, _ in tasks) if name not in used_files]
+    if kept and unused:
+        raise ValueError(f"No sheet in {', '.join(unused)} has the columns of the first sheet")
+    return kept
+
+
+def _unique_ids(parts):
+    if len(parts) < 2 or any('List_Sr_No' not in part.columns for part in parts):
+        return parts
+    seen = set()
+    for part in parts:
+        ids = part['List_Sr_No']
+        if seen.intersection(ids.dropna().tolist()):
+            if not pd.api.types.is_numeric_dtype(ids):
+                raise ValueError("Player IDs (List_Sr_No) repeat across the uploaded files")
+            # Above every ID taken so far, zero and negative ones included, so the new IDs are positive and unused
+            part['List_Sr_No'] = ids + (max(abs(player_id) for player_id in seen) - ids.min() + 1)
+        seen.update(part['List_Sr_No'].dropna().tolist())
+    return parts
+
+
+def _make_executor(max_workers, tasks):
+    import multiprocessing
+
+    workers = min(tasks, max_workers or os.cpu_count() or 1)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _part_label(task):
+    name, _, sheet = task
+    return " / ".join(part for part in (name, sheet) if part) or "pool"
+
+
+def _sheet_names(data, file_extension):
+    if file_extension == 'csv':
+        return [None]
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def _read_part(data, file_extension, sheet, normalize, progress=None):
+    """One CSV file or workbook sheet, read chunk by chunk into a typed frame."""
+    report = progress or (lambda fraction: None)
+    if file_extension == 'csv':
+        chunks = _csv_chunks(data, normalize, report)
+    else:
+        chunks = _sheet_chunks(data, sheet, normalize, report)
+    return _merge_chunks(list(chunks))
+
+
+def _typed_chunk(df, normalize):
+    if normalize:
+        df.columns = clean_column_names(df.columns)
+        df = apply_pool_dtypes(df)
+    return df
+
+
+def _csv_chunks(data, normalize, report):
+    # Category columns are read as categoricals directly instead of as strings first
+    header = pd.read_csv(io.BytesIO(data), nrows=0).columns
+    dtype = {raw: 'category' for raw, col in zip(header, clean_column_names(header)) if col in CATEGORY_COLUMNS} if normalize else None
+    total = max(1, data.count(b"\n"))
+    rows = 0
+    with pd.read_csv(io.BytesIO(data), chunksize=CHUNK_ROWS, dtype=dtype) as reader:
+        for chunk in reader:
+            yield _typed_chunk(chunk, normalize)
+            rows += len(chunk)
+            report(min(1.0, (rows + 1) / total))
+
+
+def _sheet_chunks(data, sheet, normalize, report):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet]
+        total = worksheet.max_row or 0
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # Same placeholder names pandas gives blank header cells
+        columns = [f"Unnamed: {i}" if value is None else str(value) for i, value in enumerate(header)]
+        while columns and columns[-1].startswith("Unnamed: ") and header[len(columns) - 1] is None:
+            columns.pop()
+        if not columns:
+            return
+
+        batch, seen = [], 1
+        for row in rows:
+            seen += 1
+            row = row[:len(columns)]
+            if any(value is not None for value in row):
+                batch.append(row)
+            if len(batch) >= CHUNK_ROWS:
+                yield _typed_chunk(_records_frame(batch, columns), normalize)
+                batch = []
+                if total:
+                    report(min(1.0, seen / total))
+        if batch or seen == 1:
+            yield _typed_chunk(_records_frame(batch, columns), normalize)
+        report(1.0)
+    finally:
+        workbook.close()
+
+
+def _records_frame(rows, columns):
+    # Blank cells come back as None; pandas' own readers give NaN
+    df = pd.DataFrame.from_records(rows, columns=columns).infer_objects()
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].to_numpy(copy=True)
+        values[pd.isna(values)] = np.nan
+        df[col] = values
+    return df
+
+
+def _merge_chunks(chunks):
+    """Concatenates typed chunks, keeping categoricals as categoricals across them."""
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    categorical = [col for col in chunks[0].columns if all(isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks if col in chunk)]
+    for col in categorical:
+        categories = union_categoricals([chunk[col] for chunk in chunks if col in chunk], ignore_order=True).categories
+        for chunk in chunks:
+            if col in chunk:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    df = pd.concat(chunks, ignore_index=True)
+    # A column that was blank in one chunk comes back as object; re-infer it over the whole pool
+    objects = [col for col in df.columns if df[col].dtype == object]
+    if objects:
+        df[objects] = df[objects].infer_objects()
+    return df
+
+
+class PoolCache:
+    """Bounded cache of parsed pools, keyed by content hash.
+
+    With a ``store`` (see ``auction.store.PoolStore``) a miss in memory is
+    served from the on-disk columnar copy before falling back to parsing.
+    """
+
+    def __init__(self, max_entries=4, store=None):
+        self._entries = LRUCache(max_entries)
+        self.store = store
+
+    def load(self, data, file_extension, normalize=True, source_name=None, progress=None):
+        """Returns ``(digest, df)``, parsing ``data`` only on a cache miss."""
+        return self.load_files([(source_name or "", data)], file_extension, normalize, progress)
+
+    def load_files(self, files, file_extension, normalize=True, progress=None):
+        """Like ``load`` for ``(name, data)`` uploads merged into one pool."""
+        digest = pool_digest(files)
+        source_name = ", ".join(name for name, _ in files if name)
+        key = (digest, normalize)
+        df = self._entries.get(key)
+        if df is None:
+            variant = "" if normalize else "raw"
+            if self.store is not None:
+                df = self.store.load(digest, variant)
+            if df is None:
+                df = read_pools(files, file_extension, normalize, progress)
+                if self.store is not None:
+                    self.store.save(digest, df, source_name=source_name, variant=variant)
+            self._entries.put(key, df)
+        return digest, df
+
+    def load_cached(self, digest):
+        """Returns a pool previously written to the store, without the source file."""
+        key = (digest, True)
+        df = self._entries.get(key)
+        if df is None and self.store is not None:
+            df = self.store.load(digest)
+            if df is not None:
+                self._entries.put(key, df)
+        return df
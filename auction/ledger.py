@@ -0,0 +1,271 @@
+"""Durable SQLite ledger of the live auction.
+
+Each sale, unsold mark and budget change is written as one small WAL-mode
+transaction when the auction form is submitted, so the cost per event does
+not grow with the auction. ``load_state()`` rebuilds the session state
+(``team_list``, ``budgets``, ``player_data``, ``unsold_players``) after a
+browser crash or a restart.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from auction.store import DEFAULT_CACHE_DIR
+
+DEFAULT_LEDGER_PATH = os.path.join(DEFAULT_CACHE_DIR, "auction_ledger.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    budget NUMERIC NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sales (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    team TEXT NOT NULL,
+    player_id INTEGER,
+    name TEXT,
+    price NUMERIC NOT NULL,
+    rtm INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS unsold (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    team TEXT,
+    player_id INTEGER,
+    price NUMERIC,
+    rtm INTEGER,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class AuctionLedger:
+    """Append-style store for one auction, safe to share between sessions."""
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Autocommit mode; every write opens its own short transaction below
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def has_auction(self):
+        """True if a started auction is stored in the ledger."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM teams LIMIT 1").fetchone() is not None
+
+    @property
+    def version(self):
+        """Sequence number of the last recorded event; changes on every write."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM events").fetchone()
+        return row[0] or 0
+
+    def start(self, team_list, total_budget, current_player_id=None):
+        """Replaces the stored auction with a fresh one for ``team_list``, keeping the player on the floor."""
+        self.import_state({
+            "team_list": team_list,
+            "budgets": {team: total_budget for team in team_list},
+            "player_data": {team: [] for team in team_list},
+            "total_budget": total_budget,
+            "unsold_players": [],
+            "current_player_id": current_player_id,
+        })
+
+    def import_state(self, state):
+        """Replaces the stored auction with ``state`` in one transaction."""
+        with self._transaction() as cur:
+            for table in ("meta", "teams", "sales", "unsold", "events"):
+                cur.execute(f"DELETE FROM {table}")
+            cur.executemany(
+                "INSERT INTO teams (position, name, budget) VALUES (?, ?, ?)",
+                [(i, team, state["budgets"].get(team, 0)) for i, team in enumerate(state["team_list"])],
+            )
+            cur.executemany(
+                "INSERT INTO sales (team, player_id, name, price, rtm) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (team, p["Player ID"], p["Name"], p["Price"], int(bool(p["RTM"])))
+                    # Save files may hold sales of teams missing from team_list; they are kept, as in the engine
+                    for team, players in state["player_data"].items()
+                    for p in players
+                ],
+            )
+            cur.executemany("INSERT OR IGNORE INTO unsold (player_id) VALUES (?)", [(pid,) for pid in state.get("unsold_players", [])])
+            cur.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("total_budget", json.dumps(state.get("total_budget", 0))),
+                    ("current_player_id", json.dumps(state.get("current_player_id"))),
+                ],
+            )
+            self._log(cur, "start")
+
+    def record_sale(self, team, player_id, name, price, rtm=False):
+        """Stores a sale, deducts ``price`` from ``team`` and clears any unsold mark."""
+        with self._transaction() as cur:
+            cur.execute(
+                "INSERT INTO sales (team, player_id, name, price, rtm) VALUES (?, ?, ?, ?, ?)",
+                (team, player_id, name, price, int(bool(rtm))),
+            )
+            cur.execute("UPDATE teams SET budget = budget - ? WHERE name = ?", (price, team))
+            cur.execute("DELETE FROM unsold WHERE player_id = ?", (player_id,))
+            self._log(cur, "sale", team, player_id, price, rtm)
+
+    def record_sales(self, sales):
+        """Stores many ``(team, player_id, name, price, rtm)`` sales in one transaction."""
+        sales = [(team, player_id, name, price, int(bool(rtm))) for team, player_id, name, price, rtm in sales]
+        spent = {}
+        for team, _, _, price, _ in sales:
+            spent[team] = spent.get(team, 0) + price
+        now = time.time()
+        with self._transaction() as cur:
+            cur.executemany("INSERT INTO sales (team, player_id, name, price, rtm) VALUES (?, ?, ?, ?, ?)", sales)
+            cur.executemany("UPDATE teams SET budget = budget - ? WHERE name = ?", [(price, team) for team, price in spent.items()])
+            cur.executemany("DELETE FROM unsold WHERE player_id = ?", [(player_id,) for _, player_id, _, _, _ in sales])
+            cur.executemany(
+                "INSERT INTO events (kind, team, player_id, price, rtm, created_at) VALUES ('sale', ?, ?, ?, ?, ?)",
+                [(team, player_id, price, rtm, now) for team, player_id, _, price, rtm in sales],
+            )
+
+    def remove_sale(self, team, player_id, price, unsold=False, unsold_seq=None):
+        """Reverses ``record_sale`` for the newest sale of ``player_id`` to ``team`` (undo).
+
+        With ``unsold``, the player goes back on the unsold list, at
+        ``unsold_seq`` (their entry's old sequence number) when given.
+        """
+        with self._transaction() as cur:
+            cur.execute(
+                "DELETE FROM sales WHERE seq = (SELECT MAX(seq) FROM sales WHERE team = ? AND player_id = ?)",
+                (team, player_id),
+            )
+            cur.execute("UPDATE teams SET budget = budget + ? WHERE name = ?", (price, team))
+            if unsold:
+                cur.execute("INSERT OR IGNORE INTO unsold (seq, player_id) VALUES (?, ?)", (unsold_seq, player_id))
+            self._log(cur, "undo sale", team, player_id, price)
+
+    def remove_unsold(self, player_id):
+        """Reverses ``record_unsold`` (undo)."""
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM unsold WHERE player_id = ?", (player_id,))
+            self._log(cur, "undo unsold", player_id=player_id)
+
+    def unsold_seqs(self, player_ids):
+        """``{player_id: seq}`` of the unsold entries for ``player_ids``."""
+        player_ids = list(player_ids)
+        if not player_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT player_id, seq FROM unsold WHERE player_id IN ({', '.join('?' * len(player_ids))})", player_ids
+            ).fetchall()
+        return dict(rows)
+
+    def record_unsold(self, player_id):
+        """Marks a player unsold for the accelerated round (once)."""
+        with self._transaction() as cur:
+            cur.execute("INSERT OR IGNORE INTO unsold (player_id) VALUES (?)", (player_id,))
+            self._log(cur, "unsold", player_id=player_id)
+
+    def set_budget(self, team, budget):
+        """Records a manual budget change for ``team``."""
+        with self._transaction() as cur:
+            cur.execute("UPDATE teams SET budget = ? WHERE name = ?", (budget, team))
+            self._log(cur, "budget", team, price=budget)
+
+    def set_current_player(self, player_id):
+        with self._transaction() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('current_player_id', ?)",
+                (json.dumps(player_id),),
+            )
+
+    def set_squad_rules(self, rules):
+        """Stores the squad rules (a dict) so a resumed auction enforces the same limits."""
+        with self._transaction() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('squad_rules', ?)",
+                (json.dumps(rules),),
+            )
+
+    def squad_rules(self):
+        """Returns the stored squad rules, or None if the auction was started without any."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'squad_rules'").fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def sales(self):
+        """All sales in auction order as ``(seq, team, player_id, name, price, rtm)`` rows."""
+        with self._lock:
+            return self._conn.execute("SELECT seq, team, player_id, name, price, rtm FROM sales ORDER BY seq").fetchall()
+
+    def load_state(self):
+        """Rebuilds the auction session state from the ledger."""
+        with self._lock:
+            teams = self._conn.execute("SELECT name, budget FROM teams ORDER BY position").fetchall()
+            sales = self._conn.execute("SELECT team, player_id, name, price, rtm FROM sales ORDER BY seq").fetchall()
+            unsold = self._conn.execute("SELECT player_id FROM unsold ORDER BY seq").fetchall()
+            meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+        team_list = [name for name, _ in teams]
+        player_data = {team: [] for team in team_list}
+        for team, player_id, name, price, rtm in sales:
+            player_data.setdefault(team, []).append({"Player ID": player_id, "Name": name, "Price": price, "RTM": bool(rtm)})
+        return {
+            "team_list": team_list,
+            "budgets": dict(teams),
+            "player_data": player_data,
+            "total_budget": json.loads(meta.get("total_budget", "0")),
+            "unsold_players": [player_id for (player_id,) in unsold],
+            "current_player_id": json.loads(meta.get("current_player_id", "null")),
+        }
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def _log(self, cur, kind, team=None, player_id=None, price=None, rtm=None):
+        cur.execute(
+            "INSERT INTO events (kind, team, player_id, price, rtm, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, team, player_id, price, None if rtm is None else int(bool(rtm)), time.time()),
+        )
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` (or ``ROLLBACK`` on error) under the ledger lock."""
+
+    def __init__(self, conn, lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn.cursor()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
@@ -0,0 +1,113 @@
+"""Playing XI line-ups for the My Teams page.
+
+Each XI is an insertion-ordered dict of player key -> display name, so
+adding, membership checks and removal are O(1), and any number of XIs can
+be kept. Players picked from the pool are keyed by their player ID; rows
+typed straight into the editor get a ``custom-N`` key.
+
+``frame()`` builds the DataFrame shown in ``st.data_editor`` once per
+change of that XI. ``apply_edits()`` takes the editor's edit state
+(``edited_rows``, ``added_rows``, ``deleted_rows``, with row positions in
+that frame) and applies just those rows, instead of copying the frame and
+comparing it with the editor's output on every rerun.
+"""
+import pandas as pd
+
+DEFAULT_XI_NAMES = ["First Playing XI", "Second Playing XI", "Third Playing XI", "Fourth Playing XI"]
+
+
+class PlayingXIStore:
+    """Named XIs of ``{player_key: name}``, each with its own version."""
+
+    def __init__(self, names=DEFAULT_XI_NAMES):
+        self._xis = {name: {} for name in names}
+        self._versions = {name: 0 for name in names}
+        self._frames = {}
+        self._custom_count = 0
+
+    def names(self):
+        return list(self._xis)
+
+    def __contains__(self, xi):
+        return xi in self._xis
+
+    def __len__(self):
+        return len(self._xis)
+
+    def version(self, xi):
+        """Changes whenever ``xi`` does; used to key its editor."""
+        return self._versions[xi]
+
+    def add_xi(self, xi):
+        """Adds an empty XI; returns False if one with that name exists."""
+        if xi in self._xis:
+            return False
+        self._xis[xi] = {}
+        self._versions.setdefault(xi, 0)
+        return True
+
+    def remove_xi(self, xi):
+        self._xis.pop(xi, None)
+        self._frames.pop(xi, None)
+        # Kept so a re-created XI of the same name never reuses an old editor key
+        self._versions[xi] = self._versions.get(xi, 0) + 1
+
+    def players(self, xi):
+        """``(player_key, name)`` pairs in the order they were added."""
+        return list(self._xis[xi].items())
+
+    def has_player(self, xi, player_key):
+        return player_key in self._xis[xi]
+
+    def add(self, xi, player_key, name):
+        """Adds a player; returns False if they are already in the XI."""
+        players = self._xis[xi]
+        if player_key in players:
+            return False
+        players[player_key] = name
+        self._changed(xi)
+        return True
+
+    def remove(self, xi, player_key):
+        if self._xis[xi].pop(player_key, None) is not None:
+            self._changed(xi)
+
+    def clear(self, xi):
+        self._xis[xi] = {}
+        self._changed(xi)
+
+    def frame(self, xi):
+        """The XI as an editor DataFrame; rebuilt only after the XI changes."""
+        cached = self._frames.get(xi)
+        if cached is None or cached[0] != self._versions[xi]:
+            players = self._xis[xi]
+            ids = [None if isinstance(key, str) else key for key in players]
+            df = pd.DataFrame({"Player ID": pd.array(ids, dtype="Int64"), "Player Name": list(players.values())})
+            cached = self._frames[xi] = (self._versions[xi], df)
+        return cached[1]
+
+    def apply_edits(self, xi, edits):
+        """Applies a data_editor edit state made against ``frame(xi)``; returns True if anything changed."""
+        players = self._xis[xi]
+        keys = list(players)
+        changed = False
+        for pos, row in edits.get("edited_rows", {}).items():
+            name = row.get("Player Name")
+            if name is not None and int(pos) < len(keys):
+                players[keys[int(pos)]] = str(name).strip()
+                changed = True
+        for pos in edits.get("deleted_rows", []):
+            if pos < len(keys) and players.pop(keys[pos], None) is not None:
+                changed = True
+        for row in edits.get("added_rows", []):
+            name = str(row.get("Player Name") or "").strip()
+            if name:
+                self._custom_count += 1
+                players[f"custom-{self._custom_count}"] = name
+                changed = True
+        if changed:
+            self._changed(xi)
+        return changed
+
+    def _changed(self, xi):
+        self._versions[xi] += 1
@@ -0,0 +1,183 @@
+"""Incrementally maintained player pool used to schedule the next player.
+
+``AuctionPool`` keeps the pool's IDs sorted once, a Fenwick tree counting the
+players that are still unsold-or-unauctioned, and an insertion-ordered set of
+unsold players for the accelerated round. Every query and update is O(log n)
+or better, and the ordering matches the original scheduling rules:
+
+1. the smallest not-yet-sold ID greater than the current one;
+2. otherwise, when the current player went unsold, the next unsold ID above
+   it that is not part of the pool;
+3. otherwise the first player that went unsold (accelerated round).
+"""
+import bisect
+
+
+class AuctionPool:
+    """Tracks sold and unsold players for a pool of ``List_Sr_No`` IDs."""
+
+    def __init__(self, player_ids, sold_ids=(), unsold_ids=()):
+        self._ids = sorted(set(player_ids))
+        self._pos = {player_id: i for i, player_id in enumerate(self._ids)}
+        self._available = bytearray(b"\x01") * len(self._ids)
+        self._tree = _build_tree(len(self._ids))
+        self._remaining = len(self._ids)
+        self._sold = set()
+        # dict keeps insertion order, giving an O(1) ordered set
+        self._unsold = {}
+        # Unsold IDs that are not in the pool (e.g. from an older save file)
+        self._foreign_unsold = []
+
+        for player_id in sold_ids:
+            self.mark_sold(player_id)
+        for player_id in unsold_ids:
+            self.mark_unsold(player_id)
+
+    @classmethod
+    def from_state(cls, df, sold_ids, unsold_players):
+        """Builds the pool from the auction list and the IDs sold so far."""
+        return cls(df['List_Sr_No'].unique().tolist(), sold_ids, unsold_players)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, player_id):
+        return player_id in self._pos
+
+    @property
+    def remaining(self):
+        """Number of pool players that have not been sold."""
+        return self._remaining
+
+    @property
+    def unsold(self):
+        """Unsold player IDs in the order they went unsold."""
+        return list(self._unsold)
+
+    def is_sold(self, player_id):
+        return player_id in self._sold
+
+    def is_unsold(self, player_id):
+        return player_id in self._unsold
+
+    def mark_sold(self, player_id):
+        """Records a sale; the player also leaves the unsold list."""
+        if player_id in self._unsold:
+            self._discard_unsold(player_id)
+        if player_id in self._sold:
+            return
+        self._sold.add(player_id)
+        pos = self._pos.get(player_id)
+        if pos is not None:
+            self._set_available(pos, False)
+
+    def release(self, player_id):
+        """Reverses ``mark_sold`` (e.g. when a sale is undone)."""
+        if player_id not in self._sold:
+            return
+        self._sold.discard(player_id)
+        pos = self._pos.get(player_id)
+        if pos is not None:
+            self._set_available(pos, True)
+
+    def mark_unsold(self, player_id, position=None):
+        """Adds a player to the accelerated-round queue (once), at ``position`` if given (undo)."""
+        if player_id in self._unsold:
+            return
+        if position is not None and position < len(self._unsold):
+            queue = list(self._unsold)
+            queue.insert(position, player_id)
+            self._unsold = dict.fromkeys(queue)
+        else:
+            self._unsold[player_id] = None
+        if player_id not in self._pos:
+            bisect.insort(self._foreign_unsold, player_id)
+
+    def unmark_unsold(self, player_id):
+        """Removes a player from the unsold list without selling them."""
+        if player_id in self._unsold:
+            self._discard_unsold(player_id)
+
+    def next_available(self, current_id):
+        """Smallest unsold-or-unauctioned pool ID greater than ``current_id``."""
+        pos = self._first_available(bisect.bisect_right(self._ids, current_id))
+        return None if pos is None else self._ids[pos]
+
+    def upcoming(self, current_id, count):
+        """Up to ``count`` unsold-or-unauctioned pool IDs after ``current_id``, in order."""
+        found = []
+        pos = bisect.bisect_right(self._ids, current_id)
+        while len(found) < count:
+            pos = self._first_available(pos)
+            if pos is None:
+                break
+            found.append(self._ids[pos])
+            pos += 1
+        return found
+
+    def accelerated_next(self):
+        """First player that went unsold, or None when there are none."""
+        return next(iter(self._unsold), None)
+
+    def next_player(self, current_id):
+        """Next player to auction after ``current_id``, or None when the pool is done."""
+        next_id = self.next_available(current_id)
+        if next_id is not None:
+            return next_id
+
+        if current_id in self._unsold and self._foreign_unsold:
+            i = bisect.bisect_right(self._foreign_unsold, current_id)
+            if i < len(self._foreign_unsold):
+                return self._foreign_unsold[i]
+
+        # Main list exhausted, start accelerated round with stored unsold players
+        return self.accelerated_next()
+
+    def _discard_unsold(self, player_id):
+        del self._unsold[player_id]
+        if player_id not in self._pos:
+            self._foreign_unsold.remove(player_id)
+
+    def _set_available(self, pos, available):
+        if self._available[pos] == available:
+            return
+        self._available[pos] = available
+        delta = 1 if available else -1
+        self._remaining += delta
+        i = pos + 1
+        while i <= len(self._ids):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, pos):
+        # Available players among positions [0, pos)
+        total = 0
+        while pos > 0:
+            total += self._tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _first_available(self, start):
+        """Smallest available position >= ``start`` via Fenwick binary lifting."""
+        target = self._prefix(start) + 1
+        if target > self._remaining:
+            return None
+        pos = 0
+        step = 1 << len(self._ids).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= len(self._ids) and self._tree[nxt] < target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return pos
+
+
+def _build_tree(size):
+    # Fenwick tree over ``size`` ones, built in O(n)
+    tree = [0] + [1] * size
+    for i in range(1, size + 1):
+        parent = i + (i & -i)
+        if parent <= size:
+            tree[parent] += tree[i]
+    return tree
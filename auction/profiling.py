@@ -0,0 +1,127 @@
+"""Opt-in timing spans for app reruns.
+
+The apps wrap each rerun in ``Profiler.run()`` and the expensive stages
+(parsing, filtering, exports, squad frames, ...) in ``span()``. When no
+profiler is running, ``span()`` is one context-variable lookup returning a
+shared no-op, so the instrumentation can stay in the hot path. Every
+Streamlit session runs its script in its own thread, and the active trace
+is a ``ContextVar``, so concurrent sessions never see each other's spans.
+"""
+import contextvars
+import json
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+
+# One rerun: spans is a list of (stage, milliseconds) in the order they finished
+RunTrace = namedtuple("RunTrace", ["label", "started_at", "total_ms", "spans"])
+
+_active_spans = contextvars.ContextVar("active_spans", default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("spans", "name", "start")
+
+    def __init__(self, spans, name):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.spans.append((self.name, (time.perf_counter() - self.start) * 1000))
+        return False
+
+
+def span(name):
+    """Times the enclosed block as stage ``name`` of the current run, if one is being profiled."""
+    spans = _active_spans.get()
+    return _NOOP if spans is None else _Span(spans, name)
+
+
+def profiled(profiler, label):
+    """``profiler.run(label)``, or a no-op when profiling is off (``profiler`` is None)."""
+    return nullcontext() if profiler is None else profiler.run(label)
+
+
+class Profiler:
+    """Keeps the traces of the last ``max_runs`` profiled reruns."""
+
+    def __init__(self, max_runs=50):
+        self.runs = deque(maxlen=max_runs)
+
+    @contextmanager
+    def run(self, label):
+        """Profiles one rerun; nested inside another run it is recorded as a span instead."""
+        if _active_spans.get() is not None:
+            with span(label):
+                yield
+            return
+        spans = []
+        token = _active_spans.set(spans)
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Also reached when st.rerun()/st.stop() end the script early
+            _active_spans.reset(token)
+            self.runs.append(RunTrace(label, started_at, (time.perf_counter() - start) * 1000, spans))
+
+    def clear(self):
+        self.runs.clear()
+
+    def runs_frame(self):
+        """One row per run, newest first: label, total and the time spent in each stage."""
+        rows = []
+        for trace in reversed(self.runs):
+            row = {"Run": trace.label, "Total ms": trace.total_ms}
+            for name, ms in trace.spans:
+                row[name] = row.get(name, 0) + ms
+            rows.append(row)
+        return pd.DataFrame(rows).round(1)
+
+    def stage_stats(self):
+        """p50/p95 per stage (and for whole runs) across the kept runs."""
+        samples = {"(whole run)": [trace.total_ms for trace in self.runs]}
+        for trace in self.runs:
+            for name, ms in trace.spans:
+                samples.setdefault(name, []).append(ms)
+        return pd.DataFrame(
+            [
+                (name, len(values), np.percentile(values, 50), np.percentile(values, 95), max(values))
+                for name, values in samples.items()
+                if values
+            ],
+            columns=["Stage", "Count", "p50 ms", "p95 ms", "Max ms"],
+        ).round(2)
+
+    def export_jsonl(self):
+        """The kept runs as JSON lines, oldest first."""
+        return "".join(
+            json.dumps({
+                "label": trace.label,
+                "started_at": trace.started_at,
+                "total_ms": trace.total_ms,
+                "spans": [{"stage": name, "ms": ms} for name, ms in trace.spans],
+            }) + "\n"
+            for trace in self.runs
+        ).encode()
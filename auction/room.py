@@ -0,0 +1,309 @@
+"""Auction rooms shared by one auctioneer and any number of spectators.
+
+Each room owns one ``AuctionEngine``. The auctioneer session publishes
+*references* to its pool DataFrame, player index and auction state; nothing
+is copied per viewer. Spectators read the room under its lock and get
+shallow copies of the small per-team containers, so an extra viewer costs
+kilobytes rather than another copy of the pool.
+
+``RoomManager`` hosts many independent rooms in one process. Rooms on the
+same player list share one read-only pool DataFrame, and when the resident
+rooms exceed a room count or memory budget, the least recently used idle
+ones are written to a binary snapshot on disk and dropped. The next access
+restores a room from its snapshot and the shared pool.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from auction.constraints import SquadRules
+from auction.engine import AuctionEngine
+from auction.ledger import DEFAULT_LEDGER_PATH, AuctionLedger
+from auction.snapshot import SnapshotError, dump_binary, load_snapshot
+from auction.store import DEFAULT_CACHE_DIR
+
+DEFAULT_ROOM_ID = "main"
+ROOMS_DIR = os.path.join(DEFAULT_CACHE_DIR, "rooms")
+
+# Rough memory per room besides its pool: engine, indexes and state containers, plus each sale
+_ROOM_BYTES = 256 * 1024
+_SALE_BYTES = 512
+
+# An auctioneer session not heard from for this long may be taken over
+STALE_AUCTIONEER_SECONDS = 30
+
+# Point-in-time view of a room handed to spectator sessions
+RoomView = namedtuple("RoomView", ["version", "state", "pool_df", "player_index", "aggregates", "updated_at"])
+
+
+class AuctionRoom:
+    """Shared, lock-protected view of one live auction."""
+
+    def __init__(self, room_id=DEFAULT_ROOM_ID, lock=None):
+        self.room_id = room_id
+        # Re-entrant so the auctioneer can hold it around a sale and still publish
+        self.lock = lock if lock is not None else threading.RLock()
+        self.engine = None
+        self.last_access = time.time()
+        self.pool_df = None
+        self.pool_digest = None
+        self.player_index = None
+        self.aggregates = None
+        self.state = None
+        self.version = 0
+        self.updated_at = None
+        self.auctioneer = None
+        # When the auctioneer session last claimed or checked in
+        self.auctioneer_seen = None
+
+    def claim(self, session_id, take_over=False):
+        """Makes ``session_id`` the room's only writer; returns False if someone else is.
+
+        With ``take_over``, a holder that hasn't checked in for
+        ``STALE_AUCTIONEER_SECONDS`` is replaced; an active one never is.
+        """
+        with self.lock:
+            if self.auctioneer not in (None, session_id) and not (take_over and self.auctioneer_idle() >= STALE_AUCTIONEER_SECONDS):
+                return False
+            self.auctioneer = session_id
+            self.auctioneer_seen = time.time()
+            return True
+
+    def check_in(self, session_id):
+        """Records that the auctioneer session is still open; False if it no longer holds the room."""
+        with self.lock:
+            if self.auctioneer != session_id:
+                return False
+            self.auctioneer_seen = time.time()
+            return True
+
+    def auctioneer_idle(self):
+        """Seconds since the auctioneer last claimed or checked in; 0 if nobody holds the room."""
+        if self.auctioneer is None or self.auctioneer_seen is None:
+            return 0
+        return time.time() - self.auctioneer_seen
+
+    def release(self, session_id):
+        with self.lock:
+            if self.auctioneer == session_id:
+                self.auctioneer = None
+
+    def is_auctioneer(self, session_id):
+        return self.auctioneer == session_id
+
+    def publish(self, session_id, state, pool_df=None, pool_digest=None, player_index=None, aggregates=None):
+        """Shares the auctioneer's current state with spectators (by reference).
+
+        ``state`` is ``AuctionEngine.live_state()``: spectators get squads from ``aggregates``.
+        """
+        with self.lock:
+            if self.auctioneer != session_id:
+                return False
+            self._share(state, pool_df, pool_digest, player_index, aggregates)
+            return True
+
+    def read(self):
+        """Returns a consistent ``RoomView`` for a spectator."""
+        with self.lock:
+            if self.state is None:
+                return RoomView(self.version, None, self.pool_df, self.player_index, self.aggregates, self.updated_at)
+            state = dict(self.state)
+            state["budgets"] = dict(state["budgets"])
+            state["unsold_players"] = list(state["unsold_players"])
+            return RoomView(self.version, state, self.pool_df, self.player_index, self.aggregates, self.updated_at)
+
+    def _share(self, state, pool_df, pool_digest, player_index, aggregates):
+        self.state = state
+        self.pool_df = pool_df
+        self.pool_digest = pool_digest
+        self.player_index = player_index
+        self.aggregates = aggregates
+        self.version += 1
+        self.updated_at = time.time()
+
+
+class RoomManager:
+    """Hosts independent auction rooms within a room count and memory budget.
+
+    ``pool_loader(digest)`` returns the pool for a restored room (e.g.
+    ``PoolCache.load_cached``); ``ledger_factory(room_id)`` opens each room's
+    ledger, by default one SQLite file per room.
+    """
+
+    def __init__(self, snapshot_dir=ROOMS_DIR, max_rooms=16, memory_budget_mb=512, min_idle_seconds=60,
+                 pool_loader=None, ledger_factory=None):
+        self.snapshot_dir = snapshot_dir
+        self.max_rooms = max_rooms
+        self.memory_budget = memory_budget_mb * 2**20
+        # Rooms touched more recently than this are never evicted, even over budget
+        self.min_idle_seconds = min_idle_seconds
+        self.pool_loader = pool_loader
+        self.ledger_factory = ledger_factory if ledger_factory is not None else self._open_ledger
+        self.evictions = 0
+        self._rooms = OrderedDict()  # room_id -> AuctionRoom, least recently used first
+        self._pools = {}  # digest -> the shared read-only pool DataFrame
+        self._pool_bytes = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, room_id):
+        return room_id in self._rooms
+
+    def room_ids(self):
+        """Resident rooms, least recently used first."""
+        with self._lock:
+            return list(self._rooms)
+
+    def get(self, room_id=DEFAULT_ROOM_ID, pool_df=None, pool_digest=None):
+        """Returns the room, restoring it from disk or creating it (with ``pool_df``) if it isn't resident."""
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None:
+                room = self._restore(room_id)
+                if room is None:
+                    room = AuctionRoom(room_id)
+                    if pool_df is not None and pool_digest is not None:
+                        pool_df = self.share_pool(pool_digest, pool_df)
+                        room.pool_digest = pool_digest
+                    room.engine = AuctionEngine(pool_df=pool_df, ledger=self.ledger_factory(room_id), lock=room.lock)
+                self._rooms[room_id] = room
+            self._rooms.move_to_end(room_id)
+            room.last_access = time.time()
+            self._evict_idle(keep=room_id)
+            return room
+
+    def adopt(self, room_id, engine):
+        """Hosts an engine built elsewhere (e.g. by a script) as ``room_id``."""
+        with self._lock:
+            room = AuctionRoom(room_id, lock=engine.lock)
+            room.engine = engine
+            self._rooms[room_id] = room
+            return self.get(room_id)
+
+    def share_pool(self, digest, pool_df):
+        """The process's one copy of the pool with ``digest``; ``pool_df`` becomes it if none is held yet."""
+        with self._lock:
+            shared = self._pools.setdefault(digest, pool_df)
+            if digest not in self._pool_bytes:
+                self._pool_bytes[digest] = int(shared.memory_usage(deep=True).sum())
+            return shared
+
+    def set_pool(self, room_id, digest, pool_df):
+        """Loads a pool into a room, sharing it with other rooms on the same player list.
+
+        The room's own list again (e.g. uploaded by a reconnecting session)
+        leaves the auction where it is; only a different list restarts it.
+        """
+        room = self.get(room_id)
+        if digest == room.pool_digest and room.engine.pool_df is not None:
+            return room.engine.pool_df
+        shared = self.share_pool(digest, pool_df)
+        previous = room.pool_digest
+        room.pool_digest = digest
+        room.engine.set_pool(shared)
+        if previous != digest:
+            self._release_pool(previous)
+        return shared
+
+    def memory_usage(self):
+        """Estimated bytes held by the resident rooms, counting each shared pool once."""
+        with self._lock:
+            total = sum(self._pool_bytes.values())
+            for room in self._rooms.values():
+                engine = room.engine
+                total += _ROOM_BYTES + _SALE_BYTES * len(engine.sales)
+                if engine.pool_df is not None and room.pool_digest not in self._pools:
+                    total += int(engine.pool_df.memory_usage().sum())
+            return total
+
+    def evict(self, room_id):
+        """Writes a room to disk and drops it from memory; False if it isn't resident or can't be restored later."""
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None or (room.engine.pool_df is not None and room.pool_digest not in self._pools):
+                return False
+            with room.lock:
+                engine = room.engine
+                meta = {
+                    "room_id": room_id,
+                    "pool_digest": room.pool_digest,
+                    "rules": engine.rules._asdict(),
+                    "evicted_at": time.time(),
+                }
+                os.makedirs(self.snapshot_dir, exist_ok=True)
+                snapshot_path, meta_path = self._paths(room_id)
+                _write_atomic(snapshot_path, dump_binary(engine.state()))
+                # Written last: a room is only restored once its metadata is there
+                _write_atomic(meta_path, json.dumps(meta).encode())
+                if engine.ledger is not None:
+                    engine.ledger.close()
+            del self._rooms[room_id]
+            self._release_pool(room.pool_digest)
+            self.evictions += 1
+            return True
+
+    def _evict_idle(self, keep):
+        now = time.time()
+        for room_id in list(self._rooms):
+            if len(self._rooms) <= self.max_rooms and self.memory_usage() <= self.memory_budget:
+                break
+            if room_id != keep and now - self._rooms[room_id].last_access >= self.min_idle_seconds:
+                self.evict(room_id)
+
+    def _restore(self, room_id):
+        snapshot_path, meta_path = self._paths(room_id)
+        try:
+            with open(meta_path) as handle:
+                meta = json.load(handle)
+            with open(snapshot_path, "rb") as handle:
+                state = load_snapshot(handle.read())
+        except (OSError, ValueError, SnapshotError):
+            return None
+
+        digest = meta.get("pool_digest")
+        pool_df = self._pools.get(digest) if digest else None
+        if pool_df is None and digest and self.pool_loader is not None:
+            pool_df = self.pool_loader(digest)
+        room = AuctionRoom(room_id)
+        room.engine = AuctionEngine(
+            pool_df=None if pool_df is None else self.share_pool(digest, pool_df),
+            ledger=self.ledger_factory(room_id),
+            rules=SquadRules(**meta["rules"]),
+            lock=room.lock,
+        )
+        room.pool_digest = digest if pool_df is not None else None
+        room.engine.apply_state(state)
+        # Spectators see the restored auction before the auctioneer acts again
+        room._share(room.engine.live_state(), room.engine.pool_df, room.pool_digest, room.engine.player_index, room.engine.aggregates)
+        # The room's ledger is the durable record again while it is resident
+        for path in (meta_path, snapshot_path):
+            os.remove(path)
+        return room
+
+    def _release_pool(self, digest):
+        # A pool no resident room uses is dropped; sessions still holding it keep their reference
+        if digest is not None and not any(room.pool_digest == digest for room in self._rooms.values()):
+            self._pools.pop(digest, None)
+            self._pool_bytes.pop(digest, None)
+
+    def _paths(self, room_id):
+        stem = os.path.join(self.snapshot_dir, _safe_name(room_id))
+        return stem + ".aucsnap", stem + ".json"
+
+    def _open_ledger(self, room_id):
+        if room_id == DEFAULT_ROOM_ID:
+            return AuctionLedger(DEFAULT_LEDGER_PATH)
+        return AuctionLedger(os.path.join(self.snapshot_dir, f"{_safe_name(room_id)}.sqlite3"))
+
+
+def _safe_name(room_id):
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(room_id))[:64] or "room"
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,244 @@
+"""Columnar table of the auction's sales.
+
+``SalesTable`` keeps one row per sale in parallel numpy arrays: player ID,
+team code, price and RTM flag, in the order the sales were made. Names are
+not stored for players whose name is the one the pool gives; they are
+looked up on demand, and only names that differ (typed in, or from a save
+file made with another pool) are kept. Sold IDs, a team's roster and spend
+per team are array operations instead of walks over lists of dicts.
+
+``to_player_data()`` gives the sales in the ``{team: [{"Player ID",
+"Name", "Price", "RTM"}, ...]}`` shape of save files and the ledger, and
+``from_player_data()`` reads it back.
+"""
+import numpy as np
+import pandas as pd
+
+# Stored for sales with no player ID (e.g. from old save files)
+MISSING_ID = -1
+ROSTER_COLUMNS = ["Player ID", "Name", "Price", "RTM"]
+
+
+class SalesTable:
+    """Sales as parallel arrays, plus the team list their codes index."""
+
+    def __init__(self, team_list=(), resolve_name=None, capacity=64):
+        self.resolve_name = resolve_name
+        self._teams = []
+        self._codes = {}
+        for team in team_list:
+            self.team_code(team)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._team = np.empty(capacity, dtype=np.int16)
+        self._price = np.empty(capacity, dtype=np.int64)
+        self._rtm = np.empty(capacity, dtype=bool)
+        self._size = 0
+        # Row -> name, only where it differs from the pool's name
+        self._names = {}
+        self._player_data = None
+
+    @classmethod
+    def from_player_data(cls, player_data, team_list=(), resolve_name=None):
+        """Builds the table from save-file ``player_data``."""
+        sales = cls(team_list, resolve_name, capacity=max(64, sum(len(players) for players in player_data.values())))
+        sales.extend(
+            (team, p["Player ID"], p["Price"], p["RTM"], p.get("Name"))
+            for team, players in player_data.items()
+            for p in players
+        )
+        return sales
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def teams(self):
+        """Team names in code order: the listed teams, then any that only appear in sales."""
+        return list(self._teams)
+
+    def team_code(self, team):
+        code = self._codes.get(team)
+        if code is None:
+            code = self._codes[team] = len(self._teams)
+            self._teams.append(team)
+        return code
+
+    def append(self, team, player_id, price, rtm=False, name=None):
+        """Adds a sale; returns its row."""
+        self._reserve(self._size + 1)
+        return self._put(self._size, team, player_id, price, rtm, name)
+
+    def extend(self, sales):
+        """Adds ``(team, player_id, price, rtm, name)`` sales in order."""
+        sales = list(sales)
+        self._reserve(self._size + len(sales))
+        for team, player_id, price, rtm, name in sales:
+            self._put(self._size, team, player_id, price, rtm, name)
+
+    def remove(self, team, player_id):
+        """Deletes ``team``'s latest sale of ``player_id``; returns it as a dict, or None if there is none."""
+        code = self._codes.get(team)
+        if code is None:
+            return None
+        last = self._size - 1
+        if last >= 0 and self._ids[last] == _stored_id(player_id) and self._team[last] == code:
+            # Undo takes back the newest sale, which is just the last row
+            row = last
+        else:
+            rows = np.flatnonzero((self._ids[:self._size] == _stored_id(player_id)) & (self._team[:self._size] == code))
+            if not len(rows):
+                return None
+            row = int(rows[-1])
+        sale = self.sale(row)
+        if row == last:
+            self._names.pop(row, None)
+        else:
+            for values in (self._ids, self._team, self._price, self._rtm):
+                values[row:last] = values[row + 1:self._size]
+            self._names = {(r - 1 if r > row else r): name for r, name in self._names.items() if r != row}
+        self._size -= 1
+        self._changed()
+        return sale
+
+    def sale(self, row):
+        """One sale as a save-file dict."""
+        return {
+            "Player ID": _player_id(int(self._ids[row])),
+            "Name": self.name(row),
+            "Price": _price(self._price[row]),
+            "RTM": bool(self._rtm[row]),
+        }
+
+    def name(self, row):
+        name = self._names.get(row)
+        if name is None and self.resolve_name is not None:
+            name = self.resolve_name(_player_id(int(self._ids[row])))
+        return name or ""
+
+    def set_resolver(self, resolve_name):
+        """Switches the name lookup (e.g. to a new pool), keeping the names sales already have."""
+        pinned = {row: self.name(row) for row in range(self._size)}
+        self.resolve_name = resolve_name
+        self._names = {}
+        for row, name in pinned.items():
+            self._set_name(row, name)
+        self._changed()
+
+    # --- Queries ---
+
+    def sold_ids(self):
+        """Player IDs of every sale, in sale order."""
+        ids = self._ids[:self._size]
+        return ids[ids != MISSING_ID].copy()
+
+    def pairs(self):
+        """``(team, player_id)`` of every sale, in sale order."""
+        teams = self._teams
+        return [(teams[code], _player_id(player_id)) for code, player_id in zip(self._team[:self._size].tolist(), self._ids[:self._size].tolist())]
+
+    def team_rows(self, team):
+        code = self._codes.get(team)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._team[:self._size] == code)
+
+    def roster(self, team):
+        """``team``'s sales as a frame with ``ROSTER_COLUMNS``."""
+        rows = self.team_rows(team)
+        player_ids, names, _, _ = self._columns(rows)
+        return pd.DataFrame({
+            "Player ID": player_ids,
+            "Name": names,
+            "Price": self._price[rows],
+            "RTM": self._rtm[rows],
+        }, columns=ROSTER_COLUMNS)
+
+    def spend_by_team(self):
+        """Total price paid per team, for every team in ``teams``."""
+        spend = np.bincount(self._team[:self._size], weights=self._price[:self._size], minlength=len(self._teams))
+        return pd.Series(spend.astype(self._price.dtype), index=self._teams)
+
+    def squad_counts(self):
+        return pd.Series(np.bincount(self._team[:self._size], minlength=len(self._teams)), index=self._teams)
+
+    def rtm_counts(self):
+        return pd.Series(np.bincount(self._team[:self._size][self._rtm[:self._size]], minlength=len(self._teams)), index=self._teams)
+
+    def frame(self):
+        """Every sale in order, with a ``Team`` column in front of ``ROSTER_COLUMNS``."""
+        player_ids, names, _, _ = self._columns(np.arange(self._size))
+        return pd.DataFrame({
+            "Team": [self._teams[code] for code in self._team[:self._size].tolist()],
+            "Player ID": player_ids,
+            "Name": names,
+            "Price": self._price[:self._size],
+            "RTM": self._rtm[:self._size],
+        }, columns=["Team"] + ROSTER_COLUMNS)
+
+    def to_player_data(self):
+        """The sales in the save-file shape; built once per change, so don't mutate it."""
+        if self._player_data is None:
+            player_data = {team: [] for team in self._teams}
+            columns = self._columns(np.arange(self._size))
+            for code, player_id, name, price, rtm in zip(self._team[:self._size].tolist(), *columns):
+                player_data[self._teams[code]].append({"Player ID": player_id, "Name": name, "Price": price, "RTM": rtm})
+            self._player_data = player_data
+        return self._player_data
+
+    # --- Storage ---
+
+    def _columns(self, rows):
+        """Player IDs, names, prices and RTM flags of ``rows`` as Python lists."""
+        player_ids = [_player_id(player_id) for player_id in self._ids[rows].tolist()]
+        names = self._names
+        resolve = self.resolve_name or (lambda player_id: None)
+        row_names = [names.get(row) or resolve(player_id) or "" for row, player_id in zip(rows.tolist(), player_ids)]
+        prices = self._price[rows].tolist()
+        if self._price.dtype.kind == "f":
+            prices = [int(price) if price.is_integer() else price for price in prices]
+        return player_ids, row_names, prices, self._rtm[rows].tolist()
+
+    def _put(self, row, team, player_id, price, rtm, name):
+        if self._price.dtype.kind == "i" and float(price) != int(price):
+            # A fractional price turns the whole column to floats
+            self._price = self._price.astype(np.float64)
+        self._ids[row] = _stored_id(player_id)
+        self._team[row] = self.team_code(team)
+        self._price[row] = price
+        self._rtm[row] = bool(rtm)
+        self._size = row + 1
+        self._set_name(row, name)
+        self._changed()
+        return row
+
+    def _set_name(self, row, name):
+        self._names.pop(row, None)
+        if name and (self.resolve_name is None or self.resolve_name(_player_id(int(self._ids[row]))) != name):
+            self._names[row] = name
+
+    def _reserve(self, size):
+        if size <= len(self._ids):
+            return
+        capacity = max(size, 2 * len(self._ids))
+        for attr in ("_ids", "_team", "_price", "_rtm"):
+            values = getattr(self, attr)
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            setattr(self, attr, grown)
+
+    def _changed(self):
+        self._player_data = None
+
+
+def _stored_id(player_id):
+    return MISSING_ID if player_id is None or pd.isna(player_id) else int(player_id)
+
+
+def _player_id(stored):
+    return None if stored == MISSING_ID else stored
+
+
+def _price(value):
+    # Whole prices stay ints in save files, as the app enters them
+    value = value.item()
+    return int(value) if isinstance(value, float) and value.is_integer() else value
@@ -0,0 +1,109 @@
+"""Typeahead player search over a trigram index of names.
+
+Every name is folded (case, accents, punctuation) and split into
+trigrams, with each word padded at the front so the first letters of a
+word act as a prefix index. A query is scored against all players at once
+by counting shared trigrams with ``np.bincount`` over the postings lists,
+then the best candidates are re-ranked with a bonus for words that start
+with what was typed. Because matching is by overlapping trigrams, a
+misspelt name still shares most of its grams with the real one.
+"""
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+# ``position`` is the row position in the pool the index was built from
+SearchHit = namedtuple("SearchHit", ["player_id", "name", "score", "position"])
+
+# Candidates re-ranked in Python after the vectorised trigram count
+_RERANK_POOL = 50
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold(text):
+    """Lower-cased words of ``text`` with accents and punctuation removed."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return _WORD.findall(text.lower())
+
+
+def trigrams(words, complete=True):
+    """Trigrams of ``words``, each padded with ``$$`` in front and ``$`` behind.
+
+    With ``complete=False`` the last word is still being typed, so it gets no
+    end padding and only matches names that continue it.
+    """
+    grams = set()
+    for i, word in enumerate(words):
+        padded = "$$" + word + ("$" if complete or i < len(words) - 1 else "")
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+def name_columns(df):
+    """First-name and surname columns of a pool, normalised or as uploaded."""
+    first = next((col for col in ("First_Name", "First Name") if col in df.columns), None)
+    return [col for col in (first, "Surname") if col in df.columns]
+
+
+class NameSearch:
+    """Ranked, typo-tolerant name lookup for one pool."""
+
+    def __init__(self, names, player_ids):
+        self.names = list(names)
+        self.player_ids = np.asarray(player_ids).tolist()
+        self._words = [fold(name) for name in self.names]
+        postings = defaultdict(list)
+        gram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for pos, words in enumerate(self._words):
+            grams = trigrams(words)
+            gram_counts[pos] = len(grams)
+            for gram in grams:
+                postings[gram].append(pos)
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self._gram_counts = gram_counts
+
+    @classmethod
+    def from_pool(cls, df):
+        """Index over "First Surname", keyed by ``List_Sr_No`` (row number from 1 if absent)."""
+        columns = name_columns(df)
+        if columns:
+            names = df[columns].fillna("").astype(str).agg(" ".join, axis=1).str.strip()
+        else:
+            names = [""] * len(df)
+        player_ids = df["List_Sr_No"].to_numpy() if "List_Sr_No" in df.columns else np.arange(1, len(df) + 1)
+        return cls(names, player_ids)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=10, mask=None):
+        """Best ``limit`` matches for ``query``, optionally only among rows where ``mask`` is true."""
+        words = fold(query)
+        if not words or not len(self.names):
+            return []
+        query_grams = trigrams(words, complete=False)
+        hits = [self._postings[gram] for gram in query_grams if gram in self._postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        if mask is not None:
+            shared = np.where(mask, shared, 0)
+
+        # Share of the query's grams found, damped for long names that match only a little
+        scores = shared / (len(query_grams) + 0.25 * self._gram_counts)
+        candidates = np.flatnonzero(shared)
+        if len(candidates) > _RERANK_POOL:
+            candidates = candidates[np.argpartition(-scores[candidates], _RERANK_POOL)[:_RERANK_POOL]]
+
+        ranked = []
+        for pos in candidates.tolist():
+            score = float(scores[pos])
+            name_words = self._words[pos]
+            # Every typed word starting a word of the name beats fuzzy overlap
+            if all(any(name_word.startswith(word) for name_word in name_words) for word in words):
+                score += 1.0
+            ranked.append((score, pos))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [SearchHit(self.player_ids[pos], self.names[pos], score, pos) for score, pos in ranked[:limit]]
@@ -0,0 +1,177 @@
+"""Monte Carlo simulation of the rest of an auction.
+
+Starting from the current purses and squads, every remaining player in
+scheduling order goes to a random team that can still afford them under the
+squad rules, at a log-normally distributed multiple of their reserve price.
+Richer teams (by maximum legal bid) are proportionally more likely to win.
+
+Each batch advances all of its simulations together with NumPy, one player
+at a time, and batches can be spread over a process pool. Workers only send
+back per-team arrays and win counts, never the per-simulation sales.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from auction.constraints import DEFAULT_RULES
+
+# Smallest batch worth shipping to another process
+MIN_BATCH_SIZE = 500
+
+# Remaining auction as seen by the simulator; per-player arrays are in scheduling order
+SimulationSetup = namedtuple("SimulationSetup", [
+    "team_list", "purse", "squad", "overseas",
+    "player_ids", "reserve", "is_overseas", "specialism_codes", "specialisms",
+    "rules",
+])
+
+
+def remaining_schedule(pool, current_id):
+    """Every pool player not yet sold, in the order ``AuctionPool.next_player`` brings them up.
+
+    Players skipped by jumping ahead (IDs below the current one that were
+    never put up) are never scheduled again, but can still be sold, so they
+    come last rather than being left out of the projection.
+    """
+    schedule = []
+    if current_id in pool and not pool.is_sold(current_id):
+        schedule.append(current_id)
+    schedule += pool.upcoming(current_id or 0, pool.remaining)
+    # Players that already went unsold come back in the accelerated round
+    schedule += [player_id for player_id in pool.unsold if player_id in pool]
+    schedule += pool.upcoming(0, pool.remaining)
+    # Each player once, at their first place
+    return list(dict.fromkeys(schedule))
+
+
+def build_setup(aggregates, player_index, schedule, rules=DEFAULT_RULES):
+    """Collects the arrays a simulation needs from the live aggregates and the pool index."""
+    team_list = list(aggregates.team_list)
+    totals = [aggregates.team(team) for team in team_list]
+    specialisms = [player_index.value(player_id, "Specialism") for player_id in schedule]
+    names = sorted({str(s) for s in specialisms if not pd.isna(s)})
+    codes = {name: code for code, name in enumerate(names)}
+    return SimulationSetup(
+        team_list=team_list,
+        purse=np.array([t.remaining for t in totals], dtype=float),
+        squad=np.array([t.squad_count for t in totals], dtype=np.int32),
+        overseas=np.array([t.overseas_count for t in totals], dtype=np.int32),
+        player_ids=np.array(schedule, dtype=np.int64),
+        # Players without a reserve price are assumed to go for the minimum bid
+        reserve=np.nan_to_num(
+            np.array([player_index.value(player_id, "Reserve_Price_Rs_Lakh", np.nan) for player_id in schedule], dtype=float),
+            nan=rules.min_bid,
+        ),
+        is_overseas=np.array([aggregates.is_overseas(player_id) for player_id in schedule], dtype=bool),
+        specialism_codes=np.array([-1 if pd.isna(s) else codes[str(s)] for s in specialisms], dtype=np.int32),
+        specialisms=names,
+        rules=tuple(rules),
+    )
+
+
+def simulate_batch(setup, n_sims, seed, median_multiple=1.5, spread=0.6):
+    """Runs ``n_sims`` simulations; returns final purses, squads, overseas counts, specialism counts and win counts."""
+    rng = np.random.default_rng(seed)
+    min_squad, max_squad, max_overseas, min_bid = setup.rules
+    n_teams = len(setup.team_list)
+    purse = np.tile(setup.purse, (n_sims, 1))
+    squad = np.tile(setup.squad, (n_sims, 1))
+    overseas = np.tile(setup.overseas, (n_sims, 1))
+    specialism_counts = np.zeros((n_teams, max(1, len(setup.specialisms))), dtype=np.int64)
+    # Last column counts simulations in which the player went unsold
+    wins = np.zeros((len(setup.player_ids), n_teams + 1), dtype=np.int64)
+    rows = np.arange(n_sims)
+    log_median = np.log(median_multiple)
+
+    for i, reserve in enumerate(setup.reserve):
+        max_bid = purse - min_bid * np.maximum(0, min_squad - squad - 1)
+        can_buy = (squad < max_squad) & (max_bid >= reserve)
+        if setup.is_overseas[i]:
+            can_buy &= overseas < max_overseas
+
+        # Bidding stops at the highest maximum bid among the teams still in
+        price = np.maximum(np.rint(reserve * rng.lognormal(log_median, spread, n_sims)), reserve)
+        price = np.minimum(price, np.where(can_buy, max_bid, -np.inf).max(axis=1))
+        weights = np.where(can_buy & (max_bid >= price[:, None]), max_bid, 0.0)
+        total = weights.sum(axis=1)
+        sold = total > 0
+        pick = (weights.cumsum(axis=1) > (rng.random(n_sims) * total)[:, None]).argmax(axis=1)
+        wins[i] = np.bincount(np.where(sold, pick, n_teams), minlength=n_teams + 1)
+
+        sold_rows, winners = rows[sold], pick[sold]
+        purse[sold_rows, winners] -= price[sold]
+        squad[sold_rows, winners] += 1
+        if setup.is_overseas[i]:
+            overseas[sold_rows, winners] += 1
+        if setup.specialism_codes[i] >= 0:
+            specialism_counts[:, setup.specialism_codes[i]] += np.bincount(winners, minlength=n_teams)
+
+    return purse, squad, overseas, specialism_counts, wins
+
+
+def _run_batch(args):
+    return simulate_batch(*args)
+
+
+class SimulationResult:
+    """Combined output of all batches."""
+
+    def __init__(self, setup, batches):
+        self.setup = setup
+        self.purse = np.concatenate([batch[0] for batch in batches])
+        self.squad = np.concatenate([batch[1] for batch in batches])
+        self.overseas = np.concatenate([batch[2] for batch in batches])
+        self.specialism_counts = sum(batch[3] for batch in batches)
+        self.wins = sum(batch[4] for batch in batches)
+
+    @property
+    def n_sims(self):
+        return len(self.purse)
+
+    def team_summary(self):
+        """Expected final purse (with a 10-90% band), squad size, overseas players and specialism mix per team."""
+        summary = pd.DataFrame({
+            "Team": self.setup.team_list,
+            "Final Purse": self.purse.mean(axis=0).round(0),
+            "Purse P10": np.percentile(self.purse, 10, axis=0).round(0),
+            "Purse P90": np.percentile(self.purse, 90, axis=0).round(0),
+            "Squad": self.squad.mean(axis=0).round(1),
+            "Overseas": self.overseas.mean(axis=0).round(1),
+        })
+        for code, specialism in enumerate(self.setup.specialisms):
+            summary[f"+{specialism}"] = (self.specialism_counts[:, code] / self.n_sims).round(1)
+        return summary
+
+    def landing_chances(self, player_ids=None):
+        """Chance (0-1) of each team landing each player; rows are player IDs, last column is 'Unsold'."""
+        chances = pd.DataFrame(
+            self.wins / self.n_sims,
+            index=pd.Index(self.setup.player_ids, name="Player ID"),
+            columns=self.setup.team_list + ["Unsold"],
+        )
+        return chances if player_ids is None else chances.loc[[p for p in player_ids if p in chances.index]]
+
+
+def run_simulation(setup, n_sims=10_000, median_multiple=1.5, spread=0.6, seed=None, executor=None, workers=1):
+    """Runs ``n_sims`` simulations, split into up to ``workers`` batches on ``executor`` (or inline)."""
+    if executor is None:
+        workers = 1
+    n_batches = max(1, min(workers, n_sims // MIN_BATCH_SIZE))
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    sizes = [len(part) for part in np.array_split(np.arange(n_sims), n_batches)]
+    jobs = [(setup, size, batch_seed, median_multiple, spread) for size, batch_seed in zip(sizes, seeds)]
+    if n_batches == 1:
+        batches = [_run_batch(jobs[0])]
+    else:
+        batches = list(executor.map(_run_batch, jobs))
+    return SimulationResult(setup, batches)
+
+
+def make_executor(max_workers=None):
+    """Process pool for ``run_simulation``; spawned workers are safe to start from a threaded server."""
+    import multiprocessing
+
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
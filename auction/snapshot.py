@@ -0,0 +1,204 @@
+"""On-demand export and one-shot import of the auction state.
+
+Nothing here runs on a normal rerun: the app only calls ``export()`` when
+someone asks for a download. ``orjson`` is used for JSON when it is
+installed. The binary snapshot stores ``player_data`` column-wise and
+zlib-compresses it, which is several times smaller than the JSON save.
+
+``load_snapshot()`` accepts any of the export formats except XLSX and
+validates the result against the auction state schema before the app
+applies it.
+"""
+import gzip
+import io
+import json
+import re
+import zlib
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+SNAPSHOT_MAGIC = b"AUCSNAP"
+SNAPSHOT_VERSION = 1
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "JSON": ("json", "application/json"),
+    "JSON (gzip)": ("json.gz", "application/gzip"),
+    "Binary snapshot": ("aucsnap", "application/octet-stream"),
+    "Excel squads (XLSX)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def dump_json(state, compress=False):
+    """Serializes ``state`` to compact JSON bytes, optionally gzip-compressed."""
+    if orjson is not None:
+        data = orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data = json.dumps(state, separators=(",", ":")).encode()
+    return gzip.compress(data, compresslevel=6) if compress else data
+
+
+def dump_binary(state):
+    """Serializes the Try.py auction state into a compressed columnar snapshot."""
+    team_list = list(state.get("team_list", []))
+    team_codes = {team: code for code, team in enumerate(team_list)}
+    sales = {"team": [], "id": [], "name": [], "price": [], "rtm": []}
+    for team, players in state.get("player_data", {}).items():
+        if team not in team_codes:
+            team_codes[team] = len(team_list)
+            team_list.append(team)
+        for player in players:
+            sales["team"].append(team_codes[team])
+            sales["id"].append(player["Player ID"])
+            sales["name"].append(player["Name"])
+            sales["price"].append(player["Price"])
+            sales["rtm"].append(int(bool(player["RTM"])))
+
+    body = {key: value for key, value in state.items() if key != "player_data"}
+    body["team_list"] = team_list
+    body["sales"] = sales
+    body["listed_teams"] = len(state.get("team_list", []))
+    return SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(dump_json(body), 9)
+
+
+def dump_xlsx(state):
+    """Writes a workbook with a budget summary sheet and one squad sheet per team."""
+    import pandas as pd
+
+    budgets = state.get("budgets", {})
+    player_data = state.get("player_data", {})
+    summary = pd.DataFrame(
+        [
+            {
+                "Team": team,
+                "Remaining Budget": budgets.get(team, 0),
+                "Spent": sum(p["Price"] for p in player_data.get(team, [])),
+                "Squad Count": len(player_data.get(team, [])),
+            }
+            for team in state.get("team_list", [])
+        ],
+        columns=["Team", "Remaining Budget", "Spent", "Squad Count"],
+    )
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        summary.to_excel(writer, sheet_name="Budgets", index=False)
+        used_names = {"Budgets"}
+        for team in state.get("team_list", []):
+            squad = pd.DataFrame(player_data.get(team, []), columns=["Player ID", "Name", "Price", "RTM"])
+            squad.to_excel(writer, sheet_name=_sheet_name(team, used_names), index=False)
+    return buffer.getvalue()
+
+
+class SnapshotError(ValueError):
+    """Raised when an uploaded save file is not a valid auction snapshot."""
+
+
+def load_snapshot(data):
+    """Parses JSON, gzip JSON or binary snapshot bytes into a validated auction state."""
+    try:
+        if data.startswith(SNAPSHOT_MAGIC):
+            return validate_state(_load_binary(data))
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        state = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (ValueError, OSError, zlib.error, KeyError, IndexError, TypeError) as e:
+        if isinstance(e, SnapshotError):
+            raise
+        raise SnapshotError(f"Could not read save file: {e}") from e
+    return validate_state(state)
+
+
+def validate_state(state):
+    """Checks a loaded state against the schema and fills in defaults for missing keys."""
+    if not isinstance(state, dict):
+        raise SnapshotError("Save file must contain a JSON object")
+
+    team_list = state.get("team_list", [])
+    if not isinstance(team_list, list) or not all(isinstance(team, str) and team for team in team_list):
+        raise SnapshotError("'team_list' must be a list of team names")
+    if len(set(team_list)) != len(team_list):
+        raise SnapshotError("'team_list' contains duplicate team names")
+
+    budgets = state.get("budgets", {})
+    if not isinstance(budgets, dict) or not all(_is_number(value) for value in budgets.values()):
+        raise SnapshotError("'budgets' must map team names to numbers")
+    missing = [team for team in team_list if team not in budgets]
+    if missing:
+        raise SnapshotError(f"'budgets' is missing teams: {', '.join(missing)}")
+
+    player_data = state.get("player_data", {})
+    if not isinstance(player_data, dict):
+        raise SnapshotError("'player_data' must map team names to player lists")
+    for team, players in player_data.items():
+        if not isinstance(players, list):
+            raise SnapshotError(f"'player_data' for {team} must be a list")
+        for player in players:
+            if not isinstance(player, dict) or not {"Player ID", "Name", "Price", "RTM"} <= player.keys():
+                raise SnapshotError(f"Player entries for {team} need 'Player ID', 'Name', 'Price' and 'RTM'")
+            if not (player["Player ID"] is None or _is_number(player["Player ID"])) or not _is_number(player["Price"]):
+                raise SnapshotError(f"Player entry for {team} has a non-numeric ID or price")
+
+    unsold_players = state.get("unsold_players", [])
+    if not isinstance(unsold_players, list) or not all(_is_number(player_id) for player_id in unsold_players):
+        raise SnapshotError("'unsold_players' must be a list of player IDs")
+
+    total_budget = state.get("total_budget", 0)
+    current_player_id = state.get("current_player_id")
+    if not _is_number(total_budget) or not (current_player_id is None or _is_number(current_player_id)):
+        raise SnapshotError("'total_budget' and 'current_player_id' must be numbers")
+
+    return {
+        "team_list": team_list,
+        "budgets": budgets,
+        "player_data": {team: player_data.get(team, []) for team in team_list} | player_data,
+        "total_budget": total_budget,
+        "unsold_players": unsold_players,
+        "current_player_id": current_player_id,
+    }
+
+
+def export(state, export_format, file_stem="auction_data"):
+    """Returns ``(data, file_name, mime)`` for one of ``EXPORT_FORMATS``."""
+    extension, mime = EXPORT_FORMATS[export_format]
+    if export_format == "JSON":
+        data = dump_json(state)
+    elif export_format == "JSON (gzip)":
+        data = dump_json(state, compress=True)
+    elif export_format == "Binary snapshot":
+        data = dump_binary(state)
+    else:
+        data = dump_xlsx(state)
+    return data, f"{file_stem}.{extension}", mime
+
+
+def _sheet_name(team, used_names):
+    # Excel sheet names are at most 31 characters and can't contain []:*?/\
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(team))[:31] or "Team"
+    name, suffix = base, 2
+    while name in used_names:
+        name = f"{base[:31 - len(str(suffix)) - 1]}_{suffix}"
+        suffix += 1
+    used_names.add(name)
+    return name
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _load_binary(data):
+    if data[len(SNAPSHOT_MAGIC)] != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {data[len(SNAPSHOT_MAGIC)]}")
+    body = json.loads(zlib.decompress(data[len(SNAPSHOT_MAGIC) + 1:]))
+    all_teams = body.pop("team_list")
+    sales = body.pop("sales")
+    player_data = {team: [] for team in all_teams}
+    for code, player_id, name, price, rtm in zip(sales["team"], sales["id"], sales["name"], sales["price"], sales["rtm"]):
+        player_data[all_teams[code]].append({"Player ID": player_id, "Name": name, "Price": price, "RTM": bool(rtm)})
+    body["team_list"] = all_teams[:body.pop("listed_teams")]
+    body["player_data"] = player_data
+    return body
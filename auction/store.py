@@ -0,0 +1,173 @@
+"""On-disk columnar (Arrow/Feather) copies of uploaded player pools.
+
+An uploaded spreadsheet is converted once into an uncompressed Feather file
+named after the source file's hash. Later sessions and restarts memory-map
+that file instead of going through openpyxl again. Pools can be pre-warmed
+before auction day from the command line:
+
+    python -m auction.store prewarm "IPL 2026 Auction List.xlsx"
+    python -m auction.store list
+"""
+import argparse
+import os
+import sys
+import time
+
+FORMAT_VERSION = "2"
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AUCTION_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".auction_cache"),
+)
+
+# Keys stored in the Arrow schema metadata of every cached pool
+META_DIGEST = b"auction.source_sha256"
+META_VERSION = b"auction.format_version"
+META_SOURCE = b"auction.source_name"
+META_CREATED = b"auction.created_at"
+
+
+class PoolStore:
+    """Reads and writes Feather copies of player pools keyed by content hash."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path_for(self, digest, variant=""):
+        # ``variant`` separates differently-normalized copies of the same source file
+        suffix = f"-{variant}" if variant else ""
+        return os.path.join(self.cache_dir, f"pool-{digest}{suffix}.feather")
+
+    def is_valid(self, digest, variant=""):
+        """True if a cached copy exists and was built from the file with ``digest``."""
+        metadata = self._read_metadata(self.path_for(digest, variant))
+        return (
+            metadata is not None
+            and metadata.get(META_DIGEST) == digest.encode()
+            and metadata.get(META_VERSION) == FORMAT_VERSION.encode()
+        )
+
+    def load(self, digest, variant=""):
+        """Returns the cached pool for ``digest`` memory-mapped, or None if absent or stale."""
+        from pyarrow import feather
+
+        if not self.is_valid(digest, variant):
+            return None
+        table = feather.read_table(self.path_for(digest, variant), memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    def save(self, digest, df, source_name=None, variant=""):
+        """Writes ``df`` as the cached pool for ``digest``; failures are non-fatal."""
+        import pyarrow as pa
+        from pyarrow import feather
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            except pa.ArrowException:
+                # Mixed-type columns (e.g. numbers and text) are stored as text
+                table = pa.Table.from_pandas(_stringify_mixed(df), preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata.update({
+                META_DIGEST: digest.encode(),
+                META_VERSION: FORMAT_VERSION.encode(),
+                META_SOURCE: (source_name or "").encode(),
+                META_CREATED: str(int(time.time())).encode(),
+            })
+            table = table.replace_schema_metadata(metadata)
+
+            # Write then rename so a concurrent reader never maps a half-written file
+            path = self.path_for(digest, variant)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+            return path
+        except (OSError, pa.ArrowException):
+            # The pool was parsed fine; it just won't be cached
+            return None
+
+    def entries(self):
+        """Lists cached normalized pools as dicts, newest first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not (name.startswith("pool-") and name.endswith(".feather")) or name.count("-") > 1:
+                continue
+            metadata = self._read_metadata(os.path.join(self.cache_dir, name))
+            if metadata is None or META_DIGEST not in metadata:
+                continue
+            found.append({
+                "digest": metadata[META_DIGEST].decode(),
+                "source_name": metadata.get(META_SOURCE, b"").decode(),
+                "created_at": int(metadata.get(META_CREATED, b"0")),
+            })
+        return sorted(found, key=lambda entry: entry["created_at"], reverse=True)
+
+    def _read_metadata(self, path):
+        import pyarrow as pa
+        from pyarrow import ipc
+
+        if not os.path.exists(path):
+            return None
+        try:
+            with pa.memory_map(path) as source:
+                return ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+
+def _stringify_mixed(df):
+    import pandas as pd
+
+    def text(value):
+        return value if isinstance(value, str) or pd.isna(value) else str(value)
+
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(text)
+        elif isinstance(df[col].dtype, pd.CategoricalDtype) and df[col].cat.categories.dtype == object:
+            # Categories such as 1 and "1" may merge once written as text
+            df[col] = df[col].astype(object).map(text).astype("category")
+    return df
+
+
+def prewarm(path, store=None):
+    """Converts the spreadsheet at ``path`` into a cached pool and returns its digest."""
+    from auction.ingest import file_digest, read_pool
+
+    store = store or PoolStore()
+    with open(path, "rb") as handle:
+        data = handle.read()
+    digest = file_digest(data)
+    if not store.is_valid(digest):
+        file_extension = os.path.splitext(path)[1].lstrip(".").lower()
+        store.save(digest, read_pool(data, file_extension), source_name=os.path.basename(path))
+    return digest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m auction.store", description="Manage cached player pools.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    prewarm_cmd = commands.add_parser("prewarm", help="convert auction list files into cached pools")
+    prewarm_cmd.add_argument("files", nargs="+")
+    commands.add_parser("list", help="list cached pools")
+    args = parser.parse_args(argv)
+
+    store = PoolStore(args.cache_dir)
+    if args.command == "prewarm":
+        for path in args.files:
+            start = time.perf_counter()
+            digest = prewarm(path, store)
+            print(f"{path}: {digest[:12]} ({(time.perf_counter() - start) * 1000:.0f} ms) -> {store.path_for(digest)}")
+    else:
+        for entry in store.entries():
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created_at"]))
+            print(f"{entry['digest'][:12]}  {created}  {entry['source_name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
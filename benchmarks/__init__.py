@@ -0,0 +1 @@
+"""Benchmarks for the auction core; run with ``python -m benchmarks.bench_engine``."""
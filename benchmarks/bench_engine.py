@@ -0,0 +1,174 @@
+"""Runs full auctions on synthetic pools through ``AuctionEngine`` and reports
+per-operation latency and memory.
+
+    python -m benchmarks.bench_engine                    # 1k, 10k and 100k players
+    python -m benchmarks.bench_engine --sizes 1000 --ledger --json results.json
+
+Each auction puts every player on the floor in scheduling order: most are
+sold, the rest go unsold and are sold in the accelerated round. Latency is
+measured in one pass and memory (tracemalloc) in a second pass, so the
+tracing overhead doesn't skew the timings.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+
+from auction.batch import apply_batch
+from auction.constraints import SquadRules
+from auction.engine import AuctionEngine
+from auction.ledger import AuctionLedger
+from auction.snapshot import EXPORT_FORMATS
+from benchmarks.synthetic import make_pool
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+TEAM_COUNT = 10
+SELL_RATE = 0.8
+
+
+def run_auction(pool_df, ledger=None, seed=0, timings=None):
+    """Drives one complete auction; ``timings`` collects nanoseconds per operation if given."""
+    rng = np.random.default_rng(seed)
+    size = len(pool_df)
+    teams = [f"Team {i + 1}" for i in range(TEAM_COUNT)]
+    # Limits loose enough for every player to find a buyer
+    rules = SquadRules(min_squad=0, max_squad=size, max_overseas=size, min_bid=0)
+    engine = AuctionEngine(pool_df=pool_df, ledger=ledger)
+    record = _recorder(timings)
+
+    record("start", engine.start, teams, 1_000 * size, rules)
+    player_id = record("advance", engine.advance)
+    while player_id is not None:
+        card = record("card", engine.player_index.card, player_id)
+        record("eligibility", engine.constraints.evaluate, card.reserve_price, engine.is_overseas(player_id))
+        if engine.is_unsold(player_id) or rng.random() < SELL_RATE:
+            price = card.reserve_price + int(rng.integers(0, 5)) * 10
+            record("sell", engine.sell, player_id, teams[rng.integers(TEAM_COUNT)], price, False, card.name)
+        else:
+            record("unsold", engine.mark_unsold, player_id)
+        player_id = record("advance", engine.advance)
+    record("summary_frame", engine.aggregates.summary_frame)
+    return engine
+
+
+def run_exports(engine, timings):
+    record = _recorder(timings)
+    for export_format in EXPORT_FORMATS:
+        data, _, _ = record(f"export {export_format}", engine.export, export_format)
+        if not export_format.startswith("Excel"):
+            record(f"load {export_format}", engine.load_snapshot, data)
+
+
+def run_searches(engine, timings, seed=0, count=200):
+    """Typeahead queries: the first letters of a name, and a name with two letters swapped."""
+    rng = np.random.default_rng(seed)
+    record = _recorder(timings)
+    name_search = record("name index", lambda: engine.name_search)
+    for pos in rng.integers(len(name_search), size=count).tolist():
+        name = name_search.names[pos]
+        record("search prefix", name_search.search, name[:4])
+        i = int(rng.integers(1, max(2, len(name) - 1)))
+        record("search typo", name_search.search, name[:i - 1] + name[i] + name[i - 1] + name[i + 1:])
+
+
+def run_replay(engine, timings):
+    """Replays every sale of ``engine`` into a fresh auction as one batch."""
+    sales = engine.sales.frame()
+    replay = AuctionEngine(pool_df=engine.pool_df, rules=engine.rules)
+    replay.start(engine.team_list, engine.total_budget)
+    _recorder(timings)("batch replay", apply_batch, replay, sales)
+
+
+def measure(size, use_ledger=False, seed=0):
+    """Latency percentiles per operation plus tracemalloc peak for one pool size."""
+    pool_df = make_pool(size, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = defaultdict(list)
+        ledger = AuctionLedger(os.path.join(tmp, "bench.sqlite3")) if use_ledger else None
+        started = time.perf_counter()
+        engine = run_auction(pool_df, ledger, seed, timings)
+        auction_seconds = time.perf_counter() - started
+        run_exports(engine, timings)
+        run_searches(engine, timings, seed)
+        run_replay(engine, timings)
+        if ledger is not None:
+            ledger.close()
+
+        tracemalloc.start()
+        ledger = AuctionLedger(os.path.join(tmp, "bench_mem.sqlite3")) if use_ledger else None
+        engine = run_auction(pool_df, ledger, seed)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if ledger is not None:
+            ledger.close()
+
+    ops = {}
+    for op, samples in timings.items():
+        samples = np.array(samples) / 1_000
+        ops[op] = {
+            "count": len(samples),
+            "p50_us": float(np.percentile(samples, 50)),
+            "p95_us": float(np.percentile(samples, 95)),
+            "max_us": float(samples.max()),
+            "total_ms": float(samples.sum() / 1_000),
+        }
+    return {
+        "size": size,
+        "ledger": use_ledger,
+        "auction_s": auction_seconds,
+        "pool_mb": pool_df.memory_usage(deep=True).sum() / 2**20,
+        "retained_mb": retained / 2**20,
+        "peak_mb": peak / 2**20,
+        "ops": ops,
+    }
+
+
+def print_report(result):
+    print(f"\n{result['size']:,} players{' (with ledger)' if result['ledger'] else ''}: "
+          f"auction {result['auction_s']:.2f} s, pool {result['pool_mb']:.1f} MB, "
+          f"retained {result['retained_mb']:.1f} MB, peak {result['peak_mb']:.1f} MB")
+    print(f"  {'operation':<32}{'count':>9}{'p50 us':>11}{'p95 us':>11}{'max us':>12}{'total ms':>11}")
+    for op, stats in result["ops"].items():
+        print(f"  {op:<32}{stats['count']:>9,}{stats['p50_us']:>11.1f}{stats['p95_us']:>11.1f}"
+              f"{stats['max_us']:>12.1f}{stats['total_ms']:>11.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_engine", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--ledger", action="store_true", help="write every event to a temporary SQLite ledger")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        result = measure(size, args.ledger, args.seed)
+        print_report(result)
+        results.append(result)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+def _recorder(timings):
+    if timings is None:
+        return lambda op, fn, *args: fn(*args)
+
+    def record(op, fn, *args):
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        timings[op].append(time.perf_counter_ns() - start)
+        return result
+    return record
+
+
+if __name__ == "__main__":
+    sys.exit(main())
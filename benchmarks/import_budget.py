@@ -0,0 +1,97 @@
+"""Cold-start budget for Try.py's login screen and auction floor.
+
+    python -m benchmarks.import_budget            # exits 1 if a budget is exceeded
+
+Each scenario runs in a fresh interpreter. Streamlit itself is imported
+first and not counted, since the server has it loaded before any session
+starts; what is measured is the first script run of a new session: its
+wall time and which heavy modules it had to import.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import textwrap
+
+# Scenario -> (budget in ms for the first run, modules that must not be imported by it).
+# The login screen's st.image pulls in PIL and numpy inside Streamlit, so numpy isn't listed.
+BUDGETS = {
+    "login": (500, ["pandas", "pyarrow", "openpyxl", "streamlit_option_menu", "auction", "views"]),
+    "auction floor": (1000, ["openpyxl", "auction.simulation", "auction.analytics", "concurrent.futures.process"]),
+}
+
+# Modules reported in the output whether or not they are forbidden
+WATCHED = ["pandas", "numpy", "pyarrow", "openpyxl", "streamlit_option_menu", "auction.simulation", "auction.analytics"]
+
+_SCENARIO = textwrap.dedent("""
+    import json, os, sys, time
+    sys.path.insert(0, os.getcwd())
+    from streamlit.testing.v1 import AppTest
+
+    scenario = {scenario!r}
+    at = AppTest.from_file("Try.py", default_timeout=60)
+    if scenario == "auction floor":
+        # The floor needs a pool and a started auction; building them loads pandas before the clock starts
+        from auction.engine import AuctionEngine
+        from benchmarks.synthetic import make_pool
+
+        from views.shared import get_room_manager
+
+        engine = AuctionEngine(pool_df=make_pool(1000))
+        engine.start(["Team 1", "Team 2"], 10_000)
+        engine.advance()
+        get_room_manager().adopt("budget", engine)
+        at.query_params["room"] = "budget"
+        at.session_state["password_correct"] = True
+        at.session_state["auction_list_file_df"] = engine.pool_df
+        at.session_state["setup_complete"] = True
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    at.run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({{
+        "ms": elapsed_ms,
+        "new_modules": sorted(set(sys.modules) - before),
+        "exceptions": [e.value for e in at.exception],
+    }}))
+""")
+
+
+def run_scenario(scenario):
+    code = _SCENARIO.format(scenario=scenario)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _imported(name, modules):
+    return any(module == name or module.startswith(name + ".") for module in modules)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_budget", description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the fastest is compared to the budget")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for scenario, (budget_ms, forbidden) in BUDGETS.items():
+        results = [run_scenario(scenario) for _ in range(args.repeat)]
+        best = min(results, key=lambda result: result["ms"])
+        loaded = [name for name in WATCHED if _imported(name, best["new_modules"])]
+        print(f"{scenario:<14} {best['ms']:7.0f} ms (budget {budget_ms} ms)  imported: {', '.join(loaded) or '-'}")
+
+        if best["exceptions"]:
+            failures.append(f"{scenario}: script raised {best['exceptions']}")
+        if best["ms"] > budget_ms:
+            failures.append(f"{scenario}: {best['ms']:.0f} ms is over the {budget_ms} ms budget")
+        for name in forbidden:
+            if _imported(name, best["new_modules"]):
+                failures.append(f"{scenario}: imports {name}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
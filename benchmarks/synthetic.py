@@ -0,0 +1,26 @@
+"""Synthetic player pools shaped like the official auction list."""
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ["India"] * 6 + ["Australia", "England", "South Africa", "New Zealand", "Afghanistan", "West Indies", "Sri Lanka"]
+SPECIALISMS = ["BATTER", "BOWLER", "ALL-ROUNDER", "WICKETKEEPER"]
+TEAMS = ["CSK", "DC", "GT", "KKR", "LSG", "MI", "PBKS", "RCB", "RR", "SRH", None]
+RESERVE_PRICES = [30, 40, 50, 75, 100, 125, 150, 200]
+
+
+def make_pool(size, seed=0):
+    """Returns a ``size``-player pool with the normalized column names and dtypes of an ingested list."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, size + 1)
+    return pd.DataFrame({
+        "List_Sr_No": ids,
+        "First_Name": [f"First{i}" for i in ids],
+        "Surname": [f"Sur{i}" for i in ids],
+        "Country": pd.Categorical(rng.choice(COUNTRIES, size)),
+        "Specialism": pd.Categorical(rng.choice(SPECIALISMS, size)),
+        "Test_caps": rng.integers(0, 150, size, dtype=np.int16),
+        "ODI_caps": rng.integers(0, 250, size, dtype=np.int16),
+        "T20_caps": rng.integers(0, 120, size, dtype=np.int16),
+        "IPL_2025_Team": pd.Categorical(rng.choice(np.array(TEAMS, dtype=object), size)),
+        "Reserve_Price_Rs_Lakh": rng.choice(RESERVE_PRICES, size).astype(np.int16),
+    })
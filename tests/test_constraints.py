@@ -0,0 +1,62 @@
+"""Squad-rule checks and the per-team totals behind them."""
+import pandas as pd
+import pytest
+
+from auction.batch import validate_batch
+from auction.constraints import DEFAULT_RULES, IPL_RULES
+from auction.engine import AuctionEngine, SaleError
+
+
+def make_engine(rules=None):
+    ids = list(range(1, 41))
+    pool = pd.DataFrame({"List_Sr_No": ids, "First_Name": [f"P{i}" for i in ids], "Surname": "", "Country": "England"})
+    engine = AuctionEngine(pool_df=pool)
+    engine.start(["A", "B"], 10_000, rules)
+    engine.set_pool(pool)
+    return engine
+
+
+def test_unknown_team_is_not_added_by_a_lookup():
+    engine = make_engine()
+    with pytest.raises(KeyError):
+        engine.aggregates.team("a")
+    assert engine.constraints.check("a", 10) is not None
+    with pytest.raises(SaleError):
+        engine.sell(1, "a", 10)
+    assert engine.aggregates.team_list == ["A", "B"]
+    assert list(engine.aggregates.summary_frame()["Team"]) == ["A", "B"]
+
+
+def test_auctions_without_rules_have_no_squad_limits():
+    engine = make_engine()
+    assert engine.rules == DEFAULT_RULES
+    for player_id in range(1, 31):
+        engine.sell(player_id, "A", 10)
+    assert engine.aggregates.team("A").squad_count == 30
+
+
+def test_chosen_rules_are_enforced():
+    engine = make_engine(IPL_RULES)
+    for player_id in range(1, 9):
+        engine.sell(player_id, "A", 30)
+    with pytest.raises(SaleError, match="overseas"):
+        engine.sell(9, "A", 30)
+
+
+@pytest.mark.parametrize("rows, failing", [
+    # Ninth overseas player
+    ([("A", i, 30) for i in range(1, 10)], 8),
+    # Purse has to cover the rest of an 18-player squad at 30 Lakhs
+    ([("A", 1, 9_500)], 0),
+    ([("B", 1, 20_000)], 0),
+])
+def test_batches_are_judged_like_live_bids(rows, failing):
+    engine = make_engine(IPL_RULES)
+    report = validate_batch(engine, pd.DataFrame(rows, columns=["Team", "Player ID", "Price"]))
+    assert (report["Error"] != "").tolist() == [i == failing for i in range(len(rows))]
+    # Sold one by one, the same row fails for the same reason
+    for row, (team, player_id, price) in enumerate(rows):
+        if row == failing:
+            assert report["Error"][row] == engine.constraints.check(team, price, engine.is_overseas(player_id))
+            break
+        engine.sell(player_id, team, price)
@@ -0,0 +1,92 @@
+"""Undo must put the auction back exactly as it was, ledger included."""
+import copy
+import random
+
+import pandas as pd
+import pytest
+
+from auction.batch import apply_batch
+from auction.constraints import SquadRules
+from auction.engine import AuctionEngine, SaleError
+from auction.ledger import AuctionLedger
+
+TEAMS = ["A", "B", "C"]
+OPEN_RULES = SquadRules(min_squad=0, max_squad=10_000, max_overseas=10_000, min_bid=0)
+
+
+def snapshot(engine):
+    return copy.deepcopy(engine.state()), engine.ledger.load_state(), engine.pool.unsold
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_undo_restores_every_step(seed, tmp_path):
+    rng = random.Random(seed)
+    ids = list(range(1, 41))
+    pool = pd.DataFrame({"List_Sr_No": ids, "First_Name": [f"P{i}" for i in ids], "Surname": ""})
+    engine = AuctionEngine(pool_df=pool, ledger=AuctionLedger(str(tmp_path / "ledger.sqlite3")), rules=OPEN_RULES)
+    engine.start(TEAMS, 10**6)
+    engine.set_pool(pool)
+
+    states = [snapshot(engine)]
+    for _ in range(40):
+        current = engine.current_player_id
+        action = rng.random()
+        if action < 0.4 and current is not None and not engine.is_sold(current):
+            engine.sell(current, rng.choice(TEAMS), rng.randint(0, 100))
+            engine.advance()
+        elif action < 0.7 and current is not None and not engine.is_sold(current):
+            engine.mark_unsold(current)
+            engine.advance()
+        elif action < 0.8:
+            # Often sells players off the unsold list, in any order
+            candidates = [i for i in ids if not engine.is_sold(i)]
+            picked = rng.sample(candidates, min(len(candidates), rng.randint(1, 4)))
+            apply_batch(engine, pd.DataFrame({"Team": [rng.choice(TEAMS) for _ in picked], "Player ID": picked, "Price": 10}))
+        elif action < 0.9:
+            engine.set_budget(rng.choice(TEAMS), rng.randint(0, 10**6))
+        else:
+            engine.advance(rng.choice(ids))
+        states.append(snapshot(engine))
+
+    # A step can span several actions (a result joined with the move after it),
+    # so each undo must land on some earlier state, further back every time
+    latest = len(states) - 1
+    while engine.undo() is not None:
+        current = snapshot(engine)
+        assert current in states[:latest]
+        latest = max(i for i in range(latest) if states[i] == current)
+    assert snapshot(engine) == states[0]
+
+
+def test_sold_player_cannot_be_sold_again(tmp_path):
+    pool = pd.DataFrame({"List_Sr_No": [1, 2, 3], "First_Name": ["P1", "P2", "P3"], "Surname": ""})
+    engine = AuctionEngine(pool_df=pool, ledger=AuctionLedger(str(tmp_path / "ledger.sqlite3")), rules=OPEN_RULES)
+    engine.start(TEAMS, 1000)
+    engine.set_pool(pool)
+    engine.advance()
+    engine.sell(1, "A", 100)
+    engine.advance()
+    # "Load Specific Player" brings a sold player back to the floor
+    engine.advance(1)
+    with pytest.raises(SaleError):
+        engine.sell(1, "B", 50)
+    assert engine.budgets == {"A": 900, "B": 1000, "C": 1000}
+
+    while engine.undo() is not None:
+        assert engine.is_sold(1) == (1 in engine.sales.sold_ids())
+    assert not engine.is_sold(1)
+    assert engine.budgets == {"A": 1000, "B": 1000, "C": 1000}
+
+
+def test_undoing_a_repeated_sale_keeps_the_player_sold(tmp_path):
+    pool = pd.DataFrame({"List_Sr_No": [1, 2, 3], "First_Name": ["P1", "P2", "P3"], "Surname": ""})
+    engine = AuctionEngine(pool_df=pool, ledger=AuctionLedger(str(tmp_path / "ledger.sqlite3")), rules=OPEN_RULES)
+    engine.start(TEAMS, 1000)
+    engine.set_pool(pool)
+    engine.sell(1, "A", 100)
+    # Batches skip the checks, so a replay can repeat a sale
+    engine.sell_batch([("B", 1, 50, False, None)])
+    engine.undo()
+    assert engine.is_sold(1)
+    assert engine.pool.next_available(0) == 2
+    assert engine.sales.pairs() == [("A", 1)]
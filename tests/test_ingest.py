@@ -0,0 +1,47 @@
+"""Merging several pool files or sheets into one pool."""
+import io
+
+import pandas as pd
+import pytest
+
+from auction.ingest import read_pool, read_pools
+
+HEADER = b"List_Sr_No,First_Name,Surname,Country\n"
+
+
+def test_header_only_csv_gives_an_empty_pool():
+    assert read_pool(HEADER, "csv").empty
+    assert list(read_pool(HEADER, "csv", normalize=False).columns) == ["List_Sr_No", "First_Name", "Surname", "Country"]
+
+
+def test_repeated_ids_across_files_are_shifted():
+    first = HEADER + b"1,A,x,India\n2,B,y,England\n"
+    second = HEADER + b"1,C,z,India\n2,D,w,Australia\n3,E,v,India\n"
+    df = read_pools([("a.csv", first), ("b.csv", second)], "csv")
+    assert df["List_Sr_No"].tolist() == [1, 2, 3, 4, 5]
+    assert df["First_Name"].tolist() == ["A", "B", "C", "D", "E"]
+
+
+def test_sheets_with_other_columns_are_skipped():
+    data = io.BytesIO()
+    with pd.ExcelWriter(data) as writer:
+        pd.read_csv(io.BytesIO(HEADER + b"1,A,x,India\n")).to_excel(writer, sheet_name="Set 1", index=False)
+        pd.DataFrame({"Notes": ["not a player"]}).to_excel(writer, sheet_name="Notes", index=False)
+        pd.read_csv(io.BytesIO(HEADER + b"2,B,y,England\n")).to_excel(writer, sheet_name="Set 2", index=False)
+    df = read_pool(data.getvalue(), "xlsx")
+    assert df["First_Name"].tolist() == ["A", "B"]
+    assert "Notes" not in df.columns
+
+
+def test_csv_with_other_columns_is_rejected():
+    with pytest.raises(ValueError):
+        read_pools([("a.csv", HEADER + b"1,A,x,India\n"), ("notes.csv", b"Notes\nhello\n")], "csv")
+
+
+def test_shifted_ids_stay_clear_of_zero_and_negative_ids():
+    first = HEADER + b"-5,A,x,India\n0,B,y,England\n2,C,z,India\n"
+    second = HEADER + b"-1,D,w,Australia\n2,E,v,India\n"
+    ids = read_pools([("a.csv", first), ("b.csv", second)], "csv")["List_Sr_No"].tolist()
+    assert ids[:3] == [-5, 0, 2]
+    assert len(set(ids)) == 5
+    assert min(ids[3:]) > 5
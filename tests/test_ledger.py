@@ -0,0 +1,30 @@
+"""The ledger must resume exactly the auction the engine was running."""
+import json
+
+from auction.engine import AuctionEngine
+from auction.ledger import AuctionLedger
+
+
+def test_start_keeps_the_player_on_the_floor(tmp_path):
+    engine = AuctionEngine(ledger=AuctionLedger(str(tmp_path / "ledger.sqlite3")))
+    engine.advance(7)
+    engine.start(["A", "B"], 1000)
+    assert engine.ledger.load_state()["current_player_id"] == 7
+
+
+def test_imported_sales_of_unlisted_teams_are_kept(tmp_path):
+    state = {
+        "team_list": ["A"],
+        "budgets": {"A": 900},
+        "player_data": {
+            "A": [{"Player ID": 1, "Name": "P1", "Price": 100, "RTM": False}],
+            "Old": [{"Player ID": 2, "Name": "P2", "Price": 50, "RTM": True}],
+        },
+        "total_budget": 1000,
+        "unsold_players": [],
+        "current_player_id": 3,
+    }
+    engine = AuctionEngine(ledger=AuctionLedger(str(tmp_path / "ledger.sqlite3")))
+    engine.load_snapshot(json.dumps(state).encode())
+    assert engine.ledger.load_state()["player_data"] == engine.state()["player_data"]
+    assert engine.ledger.load_state()["current_player_id"] == 3
@@ -0,0 +1,79 @@
+"""AuctionPool scheduling must match the original Try.py rules exactly."""
+import random
+
+import pandas as pd
+import pytest
+
+from auction.constraints import SquadRules
+from auction.engine import AuctionEngine, SaleError
+
+TEAMS = ["A", "B", "C"]
+OPEN_RULES = SquadRules(min_squad=0, max_squad=10_000, max_overseas=10_000, min_bid=0)
+
+
+def baseline_next_player(all_ids, sold_ids, unsold_players, current_id):
+    """``get_next_available_player_id`` from the original Try.py, without session state."""
+    remaining_pool = sorted(set(all_ids) - set(sold_ids))
+    if current_id in unsold_players:
+        next_main_player = min([i for i in remaining_pool if i > current_id], default=None)
+        if next_main_player is not None:
+            return next_main_player
+        remaining_unsold = sorted([i for i in unsold_players if i > current_id])
+        if remaining_unsold:
+            return remaining_unsold[0]
+        if unsold_players:
+            return unsold_players[0]
+    next_id = min([i for i in remaining_pool if i > current_id], default=None)
+    if next_id is None and unsold_players:
+        return unsold_players[0]
+    return next_id
+
+
+def make_engine(rng):
+    # Gappy IDs, plus unsold IDs from an older list that are not in this pool
+    all_ids = sorted(rng.sample(range(1, 80), rng.randint(5, 40)))
+    foreign = rng.sample([i for i in range(1, 90) if i not in all_ids], rng.randint(0, 3))
+    pool = pd.DataFrame({"List_Sr_No": all_ids, "First_Name": [f"P{i}" for i in all_ids], "Surname": ""})
+    engine = AuctionEngine(pool_df=pool, rules=OPEN_RULES)
+    engine.apply_state({
+        "team_list": TEAMS,
+        "budgets": {team: 10**9 for team in TEAMS},
+        "player_data": {team: [] for team in TEAMS},
+        "total_budget": 10**9,
+        "unsold_players": foreign,
+        "current_player_id": all_ids[0],
+    })
+    return engine, all_ids
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_next_player_matches_baseline(seed):
+    rng = random.Random(seed)
+    engine, all_ids = make_engine(rng)
+    for _ in range(60):
+        current = engine.current_player_id
+        if current is None:
+            break
+        sold_ids = [p["Player ID"] for players in engine.player_data.values() for p in players]
+        expected = baseline_next_player(all_ids, sold_ids, engine.unsold_players, current)
+        assert engine.next_player_id(current) == expected
+
+        action = rng.random()
+        if action < 0.35:
+            if not engine.is_sold(current):
+                engine.sell(current, rng.choice(TEAMS), rng.randint(0, 100))
+            engine.advance()
+        elif action < 0.6:
+            if engine.is_sold(current):
+                with pytest.raises(SaleError):
+                    engine.mark_unsold(current)
+            else:
+                engine.mark_unsold(current)
+            engine.advance()
+        elif action < 0.8:
+            # "Load Specific Player", including players already sold
+            engine.advance(rng.choice(all_ids))
+        elif action < 0.9:
+            engine.undo()
+        else:
+            engine.advance()
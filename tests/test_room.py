@@ -0,0 +1,30 @@
+"""Who may write to a shared auction room."""
+import time
+
+from auction.room import STALE_AUCTIONEER_SECONDS, AuctionRoom
+
+
+def test_active_auctioneer_cannot_be_taken_over():
+    room = AuctionRoom("r")
+    assert room.claim("a")
+    assert not room.claim("b")
+    assert not room.claim("b", take_over=True)
+    assert room.is_auctioneer("a")
+
+
+def test_stale_auctioneer_can_be_taken_over():
+    room = AuctionRoom("r")
+    room.claim("a")
+    room.auctioneer_seen = time.time() - STALE_AUCTIONEER_SECONDS - 1
+    assert not room.claim("b")
+    assert room.claim("b", take_over=True)
+    assert not room.check_in("a")
+    assert room.check_in("b")
+
+
+def test_check_in_keeps_the_auctioneer_active():
+    room = AuctionRoom("r")
+    room.claim("a")
+    room.auctioneer_seen = time.time() - STALE_AUCTIONEER_SECONDS - 1
+    assert room.check_in("a")
+    assert not room.claim("b", take_over=True)
@@ -0,0 +1,16 @@
+"""The simulated rest of the auction covers every player still to be sold."""
+from auction.pool import AuctionPool
+from auction.simulation import remaining_schedule
+
+
+def test_schedule_includes_skipped_players():
+    # 2 sold, 4 unsold, then a jump to 7 skipped 1, 3, 5 and 6
+    pool = AuctionPool(range(1, 11), sold_ids=[2], unsold_ids=[4])
+    schedule = remaining_schedule(pool, 7)
+    assert schedule == [7, 8, 9, 10, 4, 1, 3, 5, 6]
+    assert len(schedule) == pool.remaining
+
+
+def test_schedule_before_the_first_player():
+    pool = AuctionPool(range(1, 6))
+    assert remaining_schedule(pool, None) == [1, 2, 3, 4, 5]
@@ -0,0 +1 @@
+"""Try.py pages, one module each, imported the first time the page is opened."""
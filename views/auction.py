@@ -0,0 +1,503 @@
+"""Live auction page: setup, the auction floor and the spectator view."""
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from auction.admin import profiled_rerun
+from auction.constraints import IPL_RULES, SquadRules
+from auction.engine import SaleError
+from auction.ingest import file_digest
+from auction.profiling import span
+from auction.room import STALE_AUCTIONEER_SECONDS
+from auction.snapshot import EXPORT_FORMATS, SnapshotError
+from views.shared import cached_for_version, get_engine, get_ledger, get_room, get_session_id, publish_to_room
+
+# Number of upcoming players whose cards are prepared while the current one is on the floor
+PREFETCH_PLAYER_COUNT = 3
+
+
+def render():
+    live_auction()
+
+
+@st.fragment(run_every="2s")
+def follow_room():
+    # Cheap poll: the spectator page is only redrawn once the auctioneer has published a change
+    if get_room().version != st.session_state.get("drawn_room_version"):
+        st.rerun(scope="app")
+
+
+@st.fragment(run_every="1s")
+def follow_engine():
+    # The auctioneer's heartbeat, and a full redraw after a change drawn only by
+    # the floor fragment (or made from another page), so budgets, undo/redo and
+    # the export catch up; nothing else reruns while the auction is idle
+    get_room().check_in(get_session_id())
+    if get_engine().version != st.session_state.get("drawn_version"):
+        st.rerun(scope="app")
+
+
+@profiled_rerun("Spectator view")
+def spectator_view():
+    """Read-only auction floor that follows the auctioneer's session."""
+    room_view = get_room().read()
+    st.session_state["drawn_room_version"] = room_view.version
+    follow_room()
+    state = room_view.state
+    if state is None:
+        st.info("Waiting for the auctioneer to start the auction.")
+        return
+
+    player_id = state["current_player_id"]
+    player_index = room_view.player_index
+    if player_id is not None and player_index is not None and player_id in player_index:
+        player_card = player_index.card(player_id)
+        st.markdown(f"## 💥 Bidding On: **{player_card.name}** (ID: {player_id})")
+        st.info(f"Reserve Price: **{player_card.reserve_price} Lakhs**")
+        st.dataframe(player_card.details, hide_index=True)
+    else:
+        st.info("No player on the floor right now.")
+
+    st.subheader("Team Budgets (Lakhs)")
+    if room_view.aggregates is not None:
+        st.dataframe(room_view.aggregates.summary_frame(), hide_index=True)
+
+    if state["unsold_players"]:
+        st.info(f"Unsold Players (IDs): {', '.join(map(str, sorted(state['unsold_players'])))}")
+    st.caption(f"Live view · update #{room_view.version}")
+
+
+def set_next_player(player_id=None, scope="app"):
+    """Moves to ``player_id`` (or the next scheduled player) and reruns ``scope``."""
+    engine = get_engine()
+    if engine.advance(player_id) is None and engine.has_pool:
+        st.warning("Auction Complete: No more players left in the pool.")
+    publish_to_room()
+    if scope == "fragment" and not get_script_run_ctx().fragment_ids_this_run:
+        # Fragment-scoped reruns are only allowed while a fragment is rerunning on its own
+        scope = "app"
+    st.rerun(scope=scope) # Force rerun to update the auction floor
+
+
+@st.fragment
+@profiled_rerun("Auction floor")
+def auction_floor():
+    """Current player and result form; a sale reruns only this fragment."""
+    engine = get_engine()
+    if engine.current_player_id is not None and engine.has_pool:
+        
+        player_id = engine.current_player_id
+        
+        try:
+            # Cards come from the List_Sr_No index and are usually prefetched on the previous player
+            player_index = engine.player_index
+            player_card = player_index.card(player_id)
+            player_name = player_card.name
+            reserve_price = player_card.reserve_price
+            player_index.prefetch(engine.pool.upcoming(player_id, PREFETCH_PLAYER_COUNT))
+            
+            st.markdown(f"## 💥 Bidding On: **{player_name}** (ID: {player_id})")
+            st.info(f"Reserve Price: **{reserve_price} Lakhs**")
+            
+            # Display Player Details
+            with span("player details"), st.expander(f"Player Analysis: {player_name}"):
+                st.dataframe(player_card.details, hide_index=True)
+
+            # Every team is checked once per player at the reserve price; O(#teams)
+            overseas = engine.is_overseas(player_id)
+            with span("eligibility"):
+                eligibility = cached_for_version(
+                    "bidder_eligibility",
+                    lambda: {e.team: e for e in engine.constraints.evaluate(reserve_price, overseas)},
+                )
+            with st.expander("Bidder Eligibility" + (" (Overseas player)" if overseas else "")):
+                st.dataframe(
+                    pd.DataFrame(
+                        [(e.team, e.max_bid, e.squad_slots, e.overseas_slots, e.reason or "✅") for e in eligibility.values()],
+                        columns=["Team", "Max Bid", "Squad Slots", "Overseas Slots", "Status"],
+                    ),
+                    hide_index=True,
+                )
+                
+            st.divider()
+            
+            # --- Auction Result Form ---
+            with st.form("Auction_Result_Form"):
+                col_status, col_price = st.columns(2)
+                
+                with col_status:
+                    sold_or_unsold = st.radio("Auction Outcome:", ['Sold', 'Unsold'], key="auction_outcome")
+                
+                final_price = reserve_price 
+                rtm_applied_team = None
+
+                if sold_or_unsold == 'Sold':
+                    with col_price:
+                        final_price = st.number_input("Final Bid Price (Lakhs):", min_value=reserve_price, step=1, key="final_price_input")
+                    
+                    team_sold = st.selectbox(
+                        "Winning Team:",
+                        engine.team_list,
+                        format_func=lambda t: t if t not in eligibility or eligibility[t].eligible else f"{t} ⛔",
+                        key="winning_team",
+                    )
+                    
+                    # RTM Logic
+                    rtm_teams = [t for t in engine.team_list if t != team_sold]
+                    
+                    if rtm_teams:
+                        st.subheader("Right To Match (RTM) Option")
+                        use_rtm = st.checkbox(f"Use RTM card?", key="rtm_used")
+                        
+                        if use_rtm:
+                            rtm_applied_team = st.selectbox("Team that used RTM:", rtm_teams, key="rtm_team")
+
+                submitted = st.form_submit_button("Finalize and Move to Next Player")
+
+                if submitted:
+                    st.session_state["bid_submitted_at"] = time.perf_counter()
+                    if sold_or_unsold == 'Sold':
+                        
+                        buyer_team = rtm_applied_team if rtm_applied_team else team_sold
+                        
+                        try:
+                            # Squads, budgets, indexes and the ledger are updated by the engine under the room lock
+                            with span("record sale"):
+                                engine.sell(player_id, buyer_team, final_price, bool(rtm_applied_team), player_name)
+                        except SaleError as e:
+                            st.error(f"Transaction failed! **{buyer_team}**: {e}.")
+                            # Do NOT move to next player
+                        else:
+                            st.success(f"Player **{player_name}** sold to **{buyer_team}** for **{final_price} Lakhs**.")
+                            set_next_player(scope="fragment")
+
+                    elif sold_or_unsold == 'Unsold':
+                        try:
+                            engine.mark_unsold(player_id)
+                        except SaleError as e:
+                            st.error(f"Can't mark **{player_name}** as unsold: {e}.")
+                        else:
+                            st.warning(f"Player **{player_name}** is Unsold and added to the list for accelerated rounds.")
+                            set_next_player(scope="fragment")
+                        
+                    # st.rerun is inside set_next_player
+
+        except Exception as e:
+            st.error(f"Error processing player ID {player_id}. Check file data or skip player. Error: {e}")
+            engine.clear_current()
+            publish_to_room()
+            st.rerun()
+
+    elif not engine.has_pool:
+        st.warning("Please upload the auction list file in the Home tab to begin the auction setup.")
+    else:
+        st.info("Setup complete. Click 'Next Player (Sequential)' in the sidebar to start the auction!")
+
+    # Time from "Finalize" to the next player being drawn, measured on the server
+    if st.session_state.get("bid_submitted_at") is not None:
+        st.session_state["last_bid_ms"] = (time.perf_counter() - st.session_state["bid_submitted_at"]) * 1000
+        st.session_state["bid_submitted_at"] = None
+    if st.session_state.get("last_bid_ms") is not None:
+        st.caption(f"Last result recorded and redrawn in {st.session_state['last_bid_ms']:.0f} ms")
+
+
+@st.cache_resource
+def get_simulation_executor():
+    # Worker processes are started once per server and reused by every simulation
+    from auction.simulation import make_executor
+
+    return make_executor()
+
+
+def strategic_timeout():
+    """Simulates the rest of the auction from the current purses, squads and schedule."""
+    with st.expander("Strategic Timeout: Simulate the Rest of the Auction"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_sims = st.number_input("Simulations:", min_value=100, max_value=50_000, value=10_000, step=1000, key="sim_count")
+        with col2:
+            median_multiple = st.slider("Typical price / reserve:", min_value=1.0, max_value=5.0, value=1.5, step=0.1, key="sim_multiple")
+        with col3:
+            spread = st.slider("Price spread:", min_value=0.1, max_value=1.5, value=0.6, step=0.1, key="sim_spread")
+
+        engine = get_engine()
+        if st.button("Run Simulation"):
+            # Imported on first use so the floor doesn't pay for the simulator on every cold start
+            from auction.simulation import build_setup, remaining_schedule, run_simulation
+
+            schedule = remaining_schedule(engine.pool, engine.current_player_id)
+            if not schedule:
+                st.info("No players left to simulate.")
+                return
+            setup = build_setup(engine.aggregates, engine.player_index, schedule, engine.rules)
+            started = time.perf_counter()
+            with span("simulation"):
+                result = run_simulation(
+                    setup, n_sims, median_multiple, spread,
+                    executor=get_simulation_executor(), workers=os.cpu_count() or 1,
+                )
+            st.session_state["simulation"] = (engine.version, result, time.perf_counter() - started)
+
+        simulation = st.session_state.get("simulation")
+        if simulation is None:
+            return
+        version, result, elapsed = simulation
+        if version != engine.version:
+            st.caption("The auction has moved on since this simulation; run it again for current odds.")
+        st.caption(f"{result.n_sims:,} simulations of {len(result.setup.player_ids)} remaining players in {elapsed:.1f} s")
+        st.dataframe(result.team_summary(), hide_index=True)
+
+        upcoming = result.setup.player_ids[:10].tolist()
+        st.subheader("Chance of Landing Upcoming Players")
+        st.dataframe(result.landing_chances(upcoming).style.format("{:.0%}"))
+
+def budget_table():
+    # Redrawn on every full rerun; the frame is only rebuilt after a change
+    budget_df = cached_for_version("budget_df", lambda: get_engine().aggregates.summary_frame()[["Team", "Budget", "Players"]])
+    st.dataframe(budget_df, hide_index=True)
+
+
+# Sales rerun only the auction floor fragment; follow_engine() then redraws the
+# page once, so these controls don't go stale and don't poll on their own.
+
+@st.fragment
+def history_controls():
+    engine = get_engine()
+    col_undo, col_redo = st.columns(2)
+    with col_undo:
+        undo_label = engine.history.undo_label()
+        if st.button("↶ Undo", disabled=undo_label is None, help=undo_label, key="undo_step"):
+            label = engine.undo()
+            st.session_state["history_message"] = f"Undone: {label}" if label else "Nothing to undo."
+            publish_to_room()
+            st.rerun()
+    with col_redo:
+        redo_label = engine.history.redo_label()
+        if st.button("↷ Redo", disabled=redo_label is None, help=redo_label, key="redo_step"):
+            label = engine.redo()
+            st.session_state["history_message"] = f"Redone: {label}" if label else "Nothing to redo."
+            publish_to_room()
+            st.rerun()
+    if st.session_state.get("history_message"):
+        st.caption(st.session_state.pop("history_message"))
+
+
+@st.fragment
+def budget_correction():
+    engine = get_engine()
+    budget_team = st.selectbox("Team:", engine.team_list, key="budget_fix_team")
+    current_budget = int(engine.budgets.get(budget_team, 0))
+    # Keyed by the budget too, so a sale elsewhere refreshes the suggested value
+    new_budget = st.number_input("Remaining budget (Lakhs):", value=current_budget, step=1, key=f"budget_fix_{budget_team}_{current_budget}")
+    if st.button("Set Budget"):
+        engine.set_budget(budget_team, new_budget)
+        publish_to_room()
+        st.rerun()
+
+
+@st.fragment
+def export_controls():
+    engine = get_engine()
+    export_format = st.selectbox("Export Format:", list(EXPORT_FORMATS), key="export_format")
+    if st.button("Prepare Export"):
+        save_auction_data(engine, export_format)
+    # Once the auction moves on, the prepared file is dropped rather than served stale
+    if engine.has_export(export_format):
+        data, file_name, mime = save_auction_data(engine, export_format)
+        st.download_button(f"Save Auction Data ({export_format})", data, file_name=file_name, mime=mime)
+        st.caption(f"Includes every result up to update #{engine.version}")
+
+
+def save_auction_data(engine, export_format):
+    # Serialized only when requested, and reused until the auction state changes
+    with span("save_auction_data"):
+        return engine.export(export_format)
+
+
+def unsold_list():
+    unsold_players = get_engine().unsold_players
+    if unsold_players:
+        st.info(cached_for_version(
+            "unsold_text",
+            lambda: f"Unsold Players (IDs): {', '.join(map(str, sorted(unsold_players)))}",
+        ))
+
+
+def live_auction():
+    st.title("LIVE AUCTION 🔨")
+
+    room = get_room()
+    session_id = get_session_id()
+    st.caption(f"Room **{room.room_id}** · open the app with `?room={room.room_id}` to join this auction")
+    # Sessions join read-only; writing takes an explicit choice, even in a room nobody holds
+    role = st.radio("Join as:", ["Spectator", "Auctioneer"], horizontal=True, key="auction_role")
+    if role == "Spectator":
+        room.release(session_id)
+        spectator_view()
+        return
+    if not room.is_auctioneer(session_id):
+        if not room.claim(session_id):
+            idle = room.auctioneer_idle()
+            if idle < STALE_AUCTIONEER_SECONDS:
+                st.warning(f"Another session is running this auction (active {idle:.0f} s ago). Join as a spectator, or take over once it has been inactive for {STALE_AUCTIONEER_SECONDS} s.")
+                return
+            st.warning(f"The session running this auction has been inactive for {idle:.0f} s.")
+            if st.button("Take Over Auction") and room.claim(session_id, take_over=True):
+                publish_to_room()
+                st.rerun()
+            return
+        publish_to_room()
+    room.check_in(session_id)
+    
+    engine = get_engine()
+
+    # Save/Load functions
+    def load_auction_data(uploaded_file):
+        # The uploader keeps returning the same file, so each snapshot is applied once per upload
+        raw = uploaded_file.getvalue()
+        digest = file_digest(raw)
+        if digest == st.session_state.get("loaded_snapshot_digest"):
+            return
+        st.session_state["loaded_snapshot_digest"] = digest
+        try:
+            with span("load_auction_data"):
+                engine.load_snapshot(raw)
+        except SnapshotError as e:
+            st.session_state["loaded_snapshot_error"] = str(e)
+            return
+        st.session_state["loaded_snapshot_error"] = None
+        publish_to_room()
+        st.success("Auction data loaded successfully! Reloading...")
+        st.rerun() 
+
+    # Setup is done once the room's auction has teams, whichever session set it up
+    if not engine.team_list:
+        ledger = get_ledger()
+        replacing = ledger.has_auction()
+        if replacing:
+            st.info("An auction in progress was found in the local ledger.")
+            if st.button("Resume Auction"):
+                engine.resume()
+                publish_to_room()
+                st.rerun()
+
+        st.header("1. Setup Teams and Budget")
+        total_budget = st.number_input("Enter the total Budget for each team (in Lakhs):", min_value=0, step=1, key="total_budget_input")
+        num_teams = st.number_input("Enter the number of teams:", min_value=1, step=1, key="num_teams")
+
+        team_inputs = [st.text_input(f"Enter the team name for team {t + 1}:", key=f'text_{t + 1}') for t in range(num_teams)]
+
+        with st.expander("Squad Rules"):
+            rule_labels = {
+                "min_squad": "Minimum squad size:",
+                "max_squad": "Maximum squad size:",
+                "max_overseas": "Maximum overseas players:",
+                "min_bid": "Minimum bid per player (Lakhs):",
+            }
+            squad_rules = {
+                rule: st.number_input(label, min_value=0, value=getattr(IPL_RULES, rule), step=1, key=f"rule_{rule}")
+                for rule, label in rule_labels.items()
+            }
+
+        if replacing:
+            confirmed = st.checkbox("Replace the auction in the ledger with these teams", key="confirm_replace_ledger")
+        else:
+            confirmed = True
+
+        if st.button("Save Teams"):
+            if not confirmed:
+                st.warning("Resume the auction in the ledger, or confirm that it should be replaced.")
+            elif all(team_inputs) and total_budget > 0:
+                engine.start(team_inputs, total_budget, SquadRules(**squad_rules))
+                publish_to_room()
+                st.success("Teams saved! Now proceed to the auction floor.")
+                st.rerun()
+            elif total_budget == 0:
+                 st.warning("Total budget must be greater than 0.")
+            else:
+                st.warning("Please fill in all team names before proceeding.")
+    else:
+        # --- Main Auction Interface ---
+        st.session_state["drawn_version"] = engine.version
+        follow_engine()
+        
+        # Sidebar Controls
+        with st.sidebar:
+            st.image("auc.png", width=250)
+            st.subheader("Auction Controls")
+            
+            if engine.has_pool:
+                if st.button("Next Player (Sequential)"):
+                    set_next_player()
+                
+                manual_id = st.number_input("Or Enter Player ID Manually (Starts at 1):", 
+                                            min_value=1, 
+                                            max_value=len(engine.pool_df), 
+                                            step=1, 
+                                            key="manual_player_id")
+                if st.button("Load Specific Player"):
+                    set_next_player(manual_id)
+
+                # Typeahead over the pool's names, ranked and tolerant of typos
+                player_query = st.text_input("Or Search Player by Name:", key="player_search")
+                if player_query:
+                    search_hits = engine.name_search.search(player_query, limit=10)
+                    if search_hits:
+                        labels = {hit.player_id: f"{hit.name} (ID: {hit.player_id})" for hit in search_hits}
+                        searched_id = st.selectbox("Matching players:", list(labels), format_func=labels.get, key="player_search_pick")
+                        if st.button("Load Searched Player"):
+                            set_next_player(searched_id)
+                    else:
+                        st.caption("No players match that name.")
+            else:
+                st.warning("Upload list in Home tab first.")
+
+            # A wrong result can be taken back without reloading an old save file
+            history_controls()
+            
+            st.divider()
+            
+            # Budget Display in Sidebar 
+            st.subheader("Team Budgets (Lakhs)")
+            budget_table()
+
+            with st.expander("Correct a Budget"):
+                budget_correction()
+
+            with st.expander("Start a New Auction"):
+                st.caption("Clears the teams, results and ledger of this room for everyone in it.")
+                if st.checkbox("I have saved this auction and want to end it", key="confirm_new_auction"):
+                    if st.button("End Auction and Set Up Again"):
+                        engine.start([], 0)
+                        engine.clear_current()
+                        publish_to_room()
+                        st.rerun()
+
+
+        # A result reruns only the floor fragment; follow_engine() brings the rest of the page up to date
+        auction_floor()
+
+        if engine.has_pool:
+            strategic_timeout()
+
+        # Load/Save Functionality
+        st.divider()
+        st.subheader("Auction Data Management")
+        col1, col2 = st.columns(2)
+        with col1:
+             export_controls()
+        with col2:
+             uploaded_file = st.file_uploader("Load Auction Data (JSON or snapshot)", type=["json", "gz", "aucsnap"])
+             if uploaded_file is not None:
+                 load_auction_data(uploaded_file)
+                 if st.session_state.get("loaded_snapshot_error"):
+                     st.error(f"Auction data was not loaded: {st.session_state['loaded_snapshot_error']}")
+             else:
+                 # Allows the same file to be loaded again after it is removed from the uploader
+                 st.session_state["loaded_snapshot_digest"] = None
+        
+        # Display Unsold List 
+        unsold_list()
@@ -0,0 +1,80 @@
+"""Home page: auction list upload and cached pools."""
+import pandas as pd
+import streamlit as st
+
+from auction.profiling import span
+from views.shared import get_pool_cache, publish_to_room, set_pool
+
+
+def render():
+    st.title("Auc-Biddy: Auction List Management.")
+    home_page()
+
+
+def home_page():    
+    # ... (File upload and filtering logic remains the same)
+    file_type_toggle = st.toggle("Upload CSV file", value=False, label_visibility='hidden')
+    file_type = "XLSX" if file_type_toggle else "CSV"
+    
+    st.info(f"You should upload a {file_type} file. Toggle above to switch file types.")
+
+    file_extension = "xlsx" if file_type == "XLSX" else "csv"
+    auction_list_files = st.file_uploader(f"Upload {file_type} files", type=[file_extension], accept_multiple_files=True)
+    
+    if auction_list_files:
+        try:
+            # Parsed once per distinct set of files; reruns get the cached, column-cleaned DataFrame.
+            # Several files (or sheets) are merged into one pool.
+            files = [(uploaded.name, uploaded.getvalue()) for uploaded in auction_list_files]
+            progress_bar = st.empty()
+            with span("parse pool"):
+                digest, auc_file_read = get_pool_cache().load_files(
+                    files, file_extension, progress=lambda fraction, text: progress_bar.progress(fraction, text=text)
+                )
+            progress_bar.empty()
+
+            # Only a different file resets the pool, so reruns mid-auction keep progress
+            if digest != st.session_state.get("auction_list_digest"):
+                if set_pool(digest, auc_file_read) is None:
+                    st.warning("Another session is running this room's auction on a different list. Only its auctioneer can change the player list.")
+                else:
+                    publish_to_room()
+                    st.success("File uploaded and player pool initialized!")
+        except Exception as e:
+            st.error(f"Error reading file. Please ensure the format is correct: {e}")
+            st.session_state["auction_list_file_df"] = None
+            st.session_state["auction_list_digest"] = None
+    elif st.session_state["auction_list_file_df"] is None:
+        # Pools converted earlier (or pre-warmed with `python -m auction.store prewarm`) open without re-parsing
+        cached_pools = get_pool_cache().store.entries()
+        if cached_pools:
+            labels = {entry["digest"]: f"{entry['source_name'] or 'Unnamed list'} ({entry['digest'][:8]})" for entry in cached_pools}
+            cached_digest = st.selectbox("Or reopen a cached player pool:", list(labels), format_func=labels.get)
+            if st.button("Open Cached Pool"):
+                cached_df = get_pool_cache().load_cached(cached_digest)
+                if cached_df is None:
+                    st.error("Cached pool is no longer available. Please upload the file again.")
+                elif set_pool(cached_digest, cached_df) is None:
+                    st.warning("Another session is running this room's auction. Only its auctioneer can change the player list.")
+                else:
+                    publish_to_room()
+                    st.rerun()
+        
+    filtered_data = pd.DataFrame() # Initialize outside the block
+
+    with st.sidebar:
+        st.image("auc.png", width=250)
+        st.header("Filter Options")
+
+        # Filtering logic... (kept simplified for focus on auction)
+        if st.session_state.get("auction_list_file_df") is not None:
+            st.success("Filters Activated")
+            auction_list = st.session_state["auction_list_file_df"]
+            filtered_data = auction_list.copy()
+            valid_cols = [col for col in auction_list.columns if col not in ['First_Name', 'Surname']]
+
+            # ... (rest of filtering UI) ...
+        
+    if st.session_state["auction_list_file_df"] is not None:
+        # ... (display filtered data) ...
+        pass
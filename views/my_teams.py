@@ -0,0 +1,84 @@
+"""My Teams page."""
+import streamlit as st
+
+from auction.playing_xi import PlayingXIStore
+from views.shared import get_engine
+
+
+def render():
+    my_teams()
+
+
+def my_teams():
+    # One store holds every XI; the editors below only send it the rows that changed
+    if "playing_xis" not in st.session_state:
+        st.session_state["playing_xis"] = PlayingXIStore()
+    playing_xis = st.session_state["playing_xis"]
+
+    st.title("My Playing XI Teams")
+    st.info("This is where you arrange your purchased players into fantasy teams.")
+
+    engine = get_engine()
+    if engine.has_pool and len(playing_xis):
+        with st.sidebar:
+            st.image("auc.png", width=250)
+            st.header("Add Players")
+            # Names and player IDs come from the room pool's search index
+            name_search = engine.name_search
+            name_query = st.text_input("Search players by name:", key="xi_player_search")
+            if name_query:
+                hits = name_search.search(name_query, limit=10)
+                if hits:
+                    selected_pos = st.selectbox("Select a player:", [hit.position for hit in hits], format_func=lambda pos: name_search.names[pos])
+                    selected_name = name_search.names[selected_pos]
+                    team_choice = st.selectbox("Select the team to add the player:", playing_xis.names())
+                    if st.button("Confirm"):
+                        if playing_xis.add(team_choice, name_search.player_ids[selected_pos], selected_name):
+                            st.success(f"Player '{selected_name}' has been added to the {team_choice}!")
+                        else:
+                            st.warning(f"Player '{selected_name}' is already in the {team_choice}.")
+                else:
+                    st.caption("No players match that name.")
+    elif not engine.has_pool:
+        st.caption("Upload the auction list in the Home tab to pick players by name; names can still be typed into a team.")
+
+    # Display the Playing XI Teams in Tabs
+    st.write("### Teams")
+    col_new, col_add = st.columns([3, 1])
+    with col_new:
+        new_xi = st.text_input("New Playing XI name:", key="new_xi_name")
+    with col_add:
+        if st.button("Add Playing XI") and new_xi.strip():
+            if not playing_xis.add_xi(new_xi.strip()):
+                st.warning(f"There is already a team called '{new_xi.strip()}'.")
+
+    if not len(playing_xis):
+        st.info("Add a Playing XI to start picking players.")
+        return
+
+    def apply_xi_edits(xi, editor_key):
+        playing_xis.apply_edits(xi, st.session_state[editor_key])
+
+    tabs = st.tabs(playing_xis.names())
+    for tab, xi in zip(tabs, playing_xis.names()):
+        with tab:
+            # Keyed by version: once its edits are applied, the editor starts again from the updated XI
+            editor_key = f"editor_xi_{xi}_{playing_xis.version(xi)}"
+            st.data_editor(
+                playing_xis.frame(xi),
+                key=editor_key,
+                num_rows="dynamic",
+                hide_index=True,
+                disabled=["Player ID"],
+                on_change=apply_xi_edits,
+                args=(xi, editor_key),
+            )
+            col_flush, col_delete = st.columns(2)
+            with col_flush:
+                if st.button(f"Flush {xi}", key=f"flush_{xi}"):
+                    playing_xis.clear(xi)
+                    st.success(f"{xi} has been cleared!")
+            with col_delete:
+                if st.button(f"Delete {xi}", key=f"delete_{xi}"):
+                    playing_xis.remove_xi(xi)
+                    st.rerun()
@@ -0,0 +1,60 @@
+"""Retention page: bulk retentions and replays of recorded sales."""
+import time
+
+import pandas as pd
+import streamlit as st
+
+from auction.batch import BATCH_COLUMNS, BatchError, apply_batch, read_transactions, validate_batch
+from views.shared import can_write, get_engine, publish_to_room
+
+
+def render():
+    retention()
+
+
+def retention():
+    st.title("Player Retention Management")
+    st.info("Use this tab to pre-load players retained before the auction starts.")
+
+    engine = get_engine()
+    if not engine.team_list:
+        st.warning("Please set up teams in the Auction tab before adding retentions.")
+        return
+
+    st.write("Upload a CSV/XLSX of retentions or recorded sales (**Team, Player ID, Price, RTM**), or enter them below. "
+             "The whole batch is checked against budgets, squad rules and the player pool, then applied in one step.")
+    batch_file = st.file_uploader("Retentions or sales file", type=["csv", "xlsx"], key="batch_file")
+    try:
+        if batch_file is not None:
+            batch = read_transactions(batch_file.getvalue(), batch_file.name.rsplit(".", 1)[-1].lower())
+        else:
+            batch = st.data_editor(
+                pd.DataFrame(columns=BATCH_COLUMNS).astype({"Player ID": "Int64", "Price": "Int64", "RTM": bool}),
+                num_rows="dynamic",
+                column_config={"Team": st.column_config.SelectboxColumn("Team", options=engine.team_list)},
+                key="retention_editor",
+            )
+        report = validate_batch(engine, batch)
+    except BatchError as e:
+        st.error(f"Error reading retentions: {e}")
+        return
+    if report.empty:
+        return
+
+    invalid = report["Error"] != ""
+    st.dataframe(report, hide_index=True)
+    if invalid.any():
+        st.error(f"{int(invalid.sum())} of {len(report)} rows can't be applied. Fix them and the batch will be re-checked.")
+    if not can_write():
+        st.warning("Another session is running this auction. Only its auctioneer can apply retentions or sales.")
+        return
+    if st.button(f"Apply {len(report)} Transactions", disabled=bool(invalid.any())):
+        start = time.perf_counter()
+        try:
+            apply_batch(engine, batch)
+        except BatchError as e:
+            # The auction changed since the batch was checked
+            st.error(f"Batch was not applied: {e}")
+        else:
+            publish_to_room()
+            st.success(f"Applied {len(report)} transactions in {(time.perf_counter() - start) * 1000:.0f} ms.")
@@ -0,0 +1,100 @@
+"""Per-process resources and per-session state shared by the Try.py pages."""
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from auction.ingest import PoolCache
+from auction.room import DEFAULT_ROOM_ID, RoomManager
+from auction.store import PoolStore
+
+
+@st.cache_resource
+def get_pool_cache():
+    # Shared across sessions so a reconnect doesn't re-parse the same upload
+    return PoolCache(max_entries=4, store=PoolStore())
+
+
+@st.cache_resource
+def get_room_manager():
+    # Every auction hosted by this server process; idle rooms are evicted to disk past the memory budget
+    return RoomManager(
+        memory_budget_mb=float(os.environ.get("AUCTION_ROOM_MEMORY_MB", 512)),
+        pool_loader=get_pool_cache().load_cached,
+    )
+
+
+def get_room_id():
+    """The session's room: ``?room=<id>`` in the URL when the session starts, otherwise the default room."""
+    if "room_id" not in st.session_state:
+        st.session_state["room_id"] = st.query_params.get("room", DEFAULT_ROOM_ID)
+    return st.session_state["room_id"]
+
+
+def get_room():
+    """The session's auction room, brought back from disk if it was evicted."""
+    return get_room_manager().get(
+        get_room_id(),
+        pool_df=st.session_state.get("auction_list_file_df"),
+        pool_digest=st.session_state.get("auction_list_digest"),
+    )
+
+
+def get_engine():
+    """Returns the room's auction engine; the page modules only render it and call its actions."""
+    return get_room().engine
+
+
+def get_ledger():
+    # Each room writes its events to its own WAL-mode SQLite ledger
+    return get_engine().ledger
+
+
+def can_write():
+    """True if this session may change the room's auction: it is the auctioneer, or nobody is."""
+    return get_room().auctioneer in (None, get_session_id())
+
+
+def set_pool(digest, pool_df):
+    """Loads a pool into the session's room, sharing one copy between rooms on the same list.
+
+    A different list makes this session the room's auctioneer if it has
+    none; if another session runs the room, nothing changes and None is
+    returned.
+    """
+    room = get_room()
+    if digest != room.pool_digest:
+        if not room.claim(get_session_id()):
+            return None
+    shared = get_room_manager().set_pool(get_room_id(), digest, pool_df)
+    st.session_state["auction_list_file_df"] = shared
+    st.session_state["auction_list_digest"] = digest
+    return shared
+
+
+def get_session_id():
+    return get_script_run_ctx().session_id
+
+
+def publish_to_room():
+    """Shares this session's auction state with spectators if it is the room's auctioneer."""
+    room = get_room()
+    engine = room.engine
+    room.publish(
+        get_session_id(),
+        engine.live_state(),
+        pool_df=engine.pool_df,
+        pool_digest=room.pool_digest,
+        player_index=engine.player_index,
+        aggregates=engine.aggregates,
+    )
+
+
+def cached_for_version(key, build):
+    """Returns ``build()``, rebuilt only when the engine's state version has changed."""
+    version = get_engine().version
+    cached = st.session_state.get(key)
+    if cached is None or cached[0] != version:
+        cached = (version, build())
+        st.session_state[key] = cached
+    return cached[1]
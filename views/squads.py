@@ -0,0 +1,49 @@
+"""Squads page: rosters and remaining purse per team."""
+import streamlit as st
+
+from auction.grid import WindowedGrid, windowed_grid
+from auction.profiling import span
+from views.shared import get_engine
+
+
+def render():
+    squads()
+
+
+def squads():
+    engine = get_engine()
+    if not engine.team_list:
+        st.warning("Please set up teams in the Auction tab before viewing squads.")
+    else:
+        st.title("Current Squads and Remaining Purse")
+        st.write("View the complete roster and remaining budget for each team. ")
+        
+        # Totals come from the incrementally maintained team view, not the player lists
+        team_aggregates = engine.aggregates
+        tabs = st.tabs(engine.team_list)
+        for i, team_name in enumerate(engine.team_list):
+            with tabs[i]:
+                team_totals = team_aggregates.team(team_name)
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                     st.metric(label="Remaining Budget (Lakhs)", value=f"₹{team_totals.remaining:,}")
+                with col2:
+                     st.metric(label="Squad Count", value=f"{team_totals.squad_count}")
+                with col3:
+                     st.metric(label="Overseas Players", value=f"{team_totals.overseas_count}")
+                with col4:
+                     st.metric(label="RTM Cards Used", value=f"{team_totals.rtm_count}")
+                if team_totals.specialisms:
+                    st.caption(" · ".join(f"{specialism}: {count}" for specialism, count in sorted(team_totals.specialisms.items())))
+                
+                if team_totals.squad_count:
+                    with span("squads frame"):
+                        team_df = team_aggregates.roster_frame(team_name, engine.sales)
+                    # Paged like the pool grid, keyed by player so rows stay put across sorts
+                    windowed_grid(WindowedGrid(team_df, key_column="Player ID"), f"squad_grid_{i}")
+                else:
+                    st.info("No players added or retained yet.")
+                    
+    with st.sidebar:
+        st.image("auc.png", width=250)